@@ -142,18 +142,31 @@ Corrected bug on line 3014. Replaced "sys.stdout(...)" with
 
 
 
-import os, sys, io
+import os, sys, io, mmap, pickle, hashlib
 from math import log2, ceil
-# reflexive import for forward references
-import eikosi as ek
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, total_ordering
+from collections import deque
 import re
 
 
 __version__ = '1.0.3'
 EXT = '.eks'
+# Types accepted wherever a target may be a path to a file
+_PATH = (str, os.PathLike)
 
+# Translation table that deletes all ASCII characters that are not permitted
+# in file names built from entry names.  Only alpha numeric and _ - are kept.
+_FILENAME_DROP = str.maketrans('', '', 
+        ''.join(chr(ii) for ii in range(128) if not (chr(ii).isalnum() or chr(ii) in '_-')))
+# The same rule for names that still contain characters beyond ASCII
+_FILENAME_STRIP = re.compile(r'[^\w\-]')
 
 
+
+# The same name parts turn up over and over in a bibliography, and initials 
+# are computed every time an author list is shown or compared.
+@lru_cache(maxsize=4096)
 def _initial(part):
     """Helper function to construct an initial from a name part"""
     escape = False
@@ -174,6 +187,120 @@ alpha characters removed, and all alpha characters translated to lower case.
 """
     return ''.join([char.lower() if char.isalpha() else '' for char in text])
 
+# Marks a missing value in dict.get() calls
+_MISS = object()
+
+def _sortkey(by):
+    """Helper function to construct a sort key for entries by item name
+The key is a tuple, (0, value), for entries that have the item.  Entries that 
+do not have the item are given the key (1,) so that they are grouped at the 
+end of the sorted list without ever comparing their values.
+"""
+    def _key(entry):
+        value = entry.__dict__.get(by, _MISS)
+        if value is _MISS:
+            value = entry.bib.get(by, _MISS)
+            if value is _MISS:
+                return (1,)
+        return (0, value)
+    return _key
+
+def _insort(slist, entry, by):
+    """Helper function to insert an entry into a list sorted by an item
+The list must already be sorted using _sortkey(by).  Like a new call to 
+sort(), the entry is placed after any entries with equal values.
+"""
+    key = _sortkey(by)
+    value = key(entry)
+    lo = 0
+    hi = len(slist)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if value < key(slist[mid]):
+            hi = mid
+        else:
+            lo = mid + 1
+    slist.insert(lo, entry)
+
+def _readfile(filename):
+    """Helper function to read the entire contents of a text file
+    source, stamp = _readfile(filename)
+
+stamp is the (modification time, size) of the file, for use with _compile().
+"""
+    with open(filename, 'r') as ff:
+        stamp = _stamp(ff)
+        return ff.read(), stamp
+
+def _stamp(ff):
+    """Helper function that identifies the version of an open file
+    stamp = _stamp(ff)
+
+Returns the file's (modification time in ns, size) tuple, or None if the object
+does not have a file descriptor behind it or has already been read from, in
+which case what is left to read is not the whole file.
+"""
+    try:
+        if ff.tell() != 0:
+            return None
+        stat = os.fstat(ff.fileno())
+    except (AttributeError, OSError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _listdir(directory, recurse):
+    """Helper function that lists and reads a directory for MasterCollection.load
+    for path, loaded in _listdir(directory, recurse):
+        ...
+
+Returns a list with an item for every eks file in the directory, and for every
+subdirectory if recurse is True, in the order os.scandir() lists them.  For a 
+subdirectory, loaded is None.  For an eks file, loaded is the (source, stamp) 
+tuple returned by _readfile().  Reading the files is pure I/O, so a pool of 
+threads overlaps it; nothing is executed here.
+"""
+    items = []
+    sourcefiles = []
+    # scandir() caches the file type, so there is no need for a separate 
+    # stat call on every item in the directory.
+    with os.scandir(directory) as contents:
+        for this in contents:
+            # If this is a directory and recursion is active
+            if this.is_dir():
+                if recurse:
+                    items.append(this.path)
+            # If this is an eks file, it will be loaded
+            elif this.name.endswith(EXT):
+                items.append(this.path)
+                sourcefiles.append(this.path)
+    if len(sourcefiles) > 1:
+        with ThreadPoolExecutor() as pool:
+            sources = dict(zip(sourcefiles, pool.map(_readfile, sourcefiles)))
+    else:
+        sources = {this:_readfile(this) for this in sourcefiles}
+    return [(this, sources.get(this)) for this in items]
+
+# Compiling the source of an eks file costs an order of magnitude more than 
+# executing it, and the same files are loaded again and again in a session.
+# Code objects are immutable, so they can be shared between loads.  Only the
+# most recent code object of each file is kept, with the stamp it was compiled
+# from, so the cache never holds more than one per file or any source text.
+_CODE_CACHE = {}
+def _compile(source, sourcefile, stamp=None):
+    """Helper function to compile the source of an eks file
+    code = _compile(source, sourcefile, stamp)
+
+When stamp is None, the source is compiled and nothing is kept.
+"""
+    if stamp is None:
+        return compile(source, sourcefile, 'exec')
+    cached = _CODE_CACHE.get(sourcefile)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    code = compile(source, sourcefile, 'exec')
+    _CODE_CACHE[sourcefile] = (stamp, code)
+    return code
+
 
 
 M_DEF_FULL = False
@@ -200,6 +327,12 @@ Or, the attribute may be modified after initialization.
 """
     months_full = [None, 'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september', 'october', 'november', 'december']
     months_abbrev = [None, 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+    # Built once from the lists above: name -> index for parsing, and the 
+    # title-case names returned by __str__()
+    _full_index = {name: index for index, name in enumerate(months_full) if name}
+    _abbrev_index = {name: index for index, name in enumerate(months_abbrev) if name}
+    _full_title = tuple(name and name.title() for name in months_full)
+    _abbrev_title = tuple(name and name.title() for name in months_abbrev)
     
     def __init__(self, source, full=M_DEF_FULL):
         self.index = None
@@ -212,29 +345,22 @@ Or, the attribute may be modified after initialization.
             # Force lower case and strip out white space
             msource = source.lower().strip()
             # Search for the month in
-            try:
-                self.index = self.months_full.index(msource)
+            index = self._full_index.get(msource)
+            if index is not None:
+                self.index = index
                 return
-            except ValueError:
-                pass
-            except:
-                raise sys.exc_info()[1]
                 
             # The month was not a full month.  Try an abbreviation
             # Strip away any trailing '.'
-            msource = msource.strip('.')
-            try:
-                self.index = self.months_abbrev.index(msource)
+            index = self._abbrev_index.get(msource.strip('.'))
+            if index is not None:
+                self.index = index
                 return
-            except ValueError:
-                pass
-            except:
-                raise sys.exc_info()[1]
             
             # OK, this doesn't look like a month.  Is it an integer?
             try:
                 self.index = int(source)
-            except:
+            except ValueError:
                 raise ValueError(f'Month: Expected a month name, its abbreviation, or an integer, but received: {repr(source)}\n')
         # Parse an integer
         elif isinstance(source, int):
@@ -254,9 +380,9 @@ Or, the attribute may be modified after initialization.
         
     def __str__(self):
         if self.full:
-            return self.months_full[self.index].title()
+            return self._full_title[self.index]
         else:
-            return self.months_abbrev[self.index].title()
+            return self._abbrev_title[self.index]
 
     def show(self):
         """Return a string representing the month.  This is a wrapper function for __str__()
@@ -264,6 +390,14 @@ Or, the attribute may be modified after initialization.
         return self.__str__()
         
 
+# The characters that AuthorList._str_parse() has to act on: whitespace, which
+# separates name parts, and the {} "" '' escapes.  All str.isspace() 
+# characters fall below U+3001.
+_AL_SPECIAL = frozenset('{}"\'').union(
+        char for char in map(chr, range(0x3001)) if char.isspace())
+# Any of the escapes at all
+_AL_ESCAPE = re.compile('[{}"\']')
+
 AL_DEF_FULLFIRST = True
 AL_DEF_FULLOTHER = False
 class AuthorList:
@@ -281,7 +415,8 @@ The AuthorList class is designed to handle author list entries automatically.
 The lists may be formatted in a Bibtex style and-separated format, or they may
 be already segmented into a list/tuple of strings, or they may be in nested 
 list/tuple for separating the name parts, or the argument may be an existing
-AuthorList object.
+AuthorList object.  An existing AuthorList is copied, so the two may be 
+changed independently.
 
 If either of the first two are input, they are automatically split by the "and"
 separator and then by whitespace into name parts.  This behavior can be escaped
@@ -340,19 +475,22 @@ the list lengths are identical, then they are treated as equal.
 It should be noted that this test does have difficulty with prefixes (like von 
 or de la).
 """
+    # There is an author list on nearly every entry, so they do without an 
+    # instance dict.  _index is the name part index kept by _name_index().
+    __slots__ = ('fullfirst', 'fullother', 'names', '_index')
+
     def __init__(self, raw, fullfirst=AL_DEF_FULLFIRST, fullother=AL_DEF_FULLOTHER):
         self.fullfirst = fullfirst
         self.fullother = fullother
         self.names = None
+        self._index = None
         
         # Pre-conditioning... force raw to be a list
         if isinstance(raw,str):
             self.names = self._str_parse(raw)
-        # If the input is a tuple, convert it to a list and try again
-        elif isinstance(raw,tuple):
-            AuthorList.__init__(self, list(raw))
-        # If raw is still not a list, dump out of it
-        elif isinstance(raw,list):
+        # Lists and tuples are handled alike, without making a list copy 
+        # of a tuple first
+        elif isinstance(raw,(list,tuple)):
             # Loop through each author
             # We will convert the entries one-by-one
             self.names = []
@@ -369,8 +507,10 @@ or de la).
                     self.names.append(this)
         # If called with an existing author list
         elif isinstance(raw,AuthorList):
-            # Do not copy the content; point to it.
-            self.names = raw.names
+            # Copy each author's list of name parts (the parts themselves 
+            # are immutable strings) so that changes to one list do not 
+            # appear in the other or leave its _index stale.
+            self.names = [list(author) for author in raw.names]
         else:
             raise Exception('AuthorList.__init__: Unhandled input: ' + repr(raw) + '\n')
         
@@ -384,29 +524,33 @@ or de la).
         return out
         
     def __str__(self):
-        out = ''
+        # Collect the pieces in lists and join them once at the end.  
+        # Repeated += on a str copies the whole string every time.
+        fullfirst = self.fullfirst
+        fullother = self.fullother
+        authors = []
         for thisauthor in self.names:
-            # If this is not the first entry
-            if out:
-                out += ' and '
+            # Check to be certain the entry is not empty
+            if not thisauthor:
+                continue
+            parts = []
             # Deal with the first name
             if len(thisauthor)>1:
                 part = thisauthor[0]
-                if self.fullfirst:
-                    out += part + ' '
+                if fullfirst:
+                    parts.append(part)
                 else:
-                    out += _initial(part) + '. '
+                    parts.append(_initial(part) + '.')
             # Deal with the middle name(s)
             for part in thisauthor[1:-1]:
-                if self.fullother:
-                    out += part + ' '
+                if fullother:
+                    parts.append(part)
                 else:
-                    out += _initial(part) + '. '
-            # Check to be certain the entry is not empty
+                    parts.append(_initial(part) + '.')
             # Append the last name
-            if len(thisauthor):
-                out += thisauthor[-1]
-        return out
+            parts.append(thisauthor[-1])
+            authors.append(' '.join(parts))
+        return ' and '.join(authors)
         
     # Define comparison operations for sorting algorithms
     def __lt__(self, b):
@@ -456,28 +600,60 @@ or de la).
         
     def _str_parse(self, raw):
         """Helper funciton for parsing strings in author names"""
+        # Most author strings have no escapes at all.  Then the name parts 
+        # are simply the whitespace-separated words, and str.split() finds 
+        # them in C.  The same name parts (initials, common surnames, von 
+        # and de) turn up all through a bibliography, so they are interned 
+        # to share one copy of each.
+        if _AL_ESCAPE.search(raw) is None:
+            words = list(map(sys.intern, raw.split()))
+            # A final "and" with nothing after it, not even whitespace, is 
+            # an error, but only once the words before it check out.
+            trailing = words and words[-1] == 'and' and not raw[-1].isspace()
+            if trailing:
+                words.pop()
+            authors = []
+            this = []
+            for text in words:
+                if text == 'and':
+                    if not this:
+                        raise Exception('AuthorList._str_parse: Leading "and" separator.\n')
+                    authors.append(this)
+                    this = []
+                else:
+                    this.append(text)
+            if trailing:
+                raise Exception('AuthorList._str_parse: Trailing "and" separator.\n')
+            authors.append(this)
+            return authors
+        
         # Initialize a state machine for scanning the string
         bracket = 0     # Bracket level counter
         quote = 0       # Quote level counter
         squote = 0      # Single quote level counter
         ii = 0          # Starting index in the string for the next name part
-        authors = [[]]  # Name part list
-        this = authors[-1]
+        authors = []    # Completed authors
+        this = []       # Name parts of the author being scanned
+        special = _AL_SPECIAL
         for jj,tchar in enumerate(raw):
+            # Most characters are ordinary parts of a name, so rule that out
+            # with a single set lookup before testing for anything else.
+            if tchar not in special:
+                continue
             # If a space has been identified outside of an escape sequence
-            if tchar.isspace() and bracket==quote==squote==0:
+            elif tchar.isspace() and bracket==quote==squote==0:
                 # If text has been identified
                 if ii<jj:
                     text = raw[ii:jj]
                     # If the text is the Bibtex "and" separator
                     if text == 'and':
                         # If the word "and" was the first thing in the list
-                        if not authors[-1]:
+                        if not this:
                             raise Exception('AuthorList._str_parse: Leading "and" separator.\n')
-                        authors.append([])
-                        this = authors[-1]
+                        authors.append(this)
+                        this = []
                     else:
-                        this.append(text)
+                        this.append(sys.intern(text))
                 ii = jj+1
             elif tchar == '{' and quote==squote==0:
                 bracket += 1
@@ -494,7 +670,8 @@ or de la).
             text = raw[ii:]
             if text == 'and':
                 raise Exception('AuthorList._str_parse: Trailing "and" separator.\n')
-            this.append(text)
+            this.append(sys.intern(text))
+        authors.append(this)
         return authors
 
     def show(self):
@@ -506,32 +683,28 @@ attributes.  If they are set to False, their respective name parts will be
 truncated to first initials using the _initial() method.  If they are True, then
 the respective name part will be written in order without modification.
 """
-        first = True
-        out = ''
+        fullfirst = self.fullfirst
+        fullother = self.fullother
+        authors = []
         for author in self.names:
-            # Append a comma to the previous author name?
-            if first:
-                first = False
-            else:
-                out += ', '
-                
             # First name
-            if self.fullfirst:
-                out += author[0] + ' '
+            if fullfirst:
+                parts = [author[0]]
             else:
-                out += _initial(author[0]) + '. '
+                parts = [_initial(author[0]) + '.']
             # Middle name(s)
             for name in author[1:-1]:
-                if self.fullother:
-                    out += name + ' '
+                if fullother:
+                    parts.append(name)
                 else:
-                    out += _initial(name) + '. '
+                    parts.append(_initial(name) + '.')
             # Last name
-            out += author[-1]
-        return out
+            parts.append(author[-1])
+            authors.append(' '.join(parts))
+        return ', '.join(authors)
         
 
-    def hasauthor(lastname=None, firstname=None, othername=None, anyname=None):
+    def hasauthor(self, lastname=None, firstname=None, othername=None, anyname=None):
         """Test whether an author name is in the author list
     position = al.hasauthor( ... )
 
@@ -558,35 +731,58 @@ with the first name "Paul", but only the first will result in True for
     
 In the current implementation of hasauthor(), the strings must match exactly.
 Special characters like {} or \\ are not processed, and case must match.
+
+The first call builds an index from each last, first, other, and any name part 
+to the positions of the authors that use it, so repeated queries against the 
+same list are dictionary lookups rather than scans.  The index is not rebuilt if
+the names list is edited in place afterwards.
 """
-        # Loop through each author and check the name
-        for index,author in enumerate(self.names):
-            # Let test be a state indicating whether a test has failed
-            test = True
-            # Apply the name tests one-by-one
-            if test and lastname is not None:
-                test = (lastname == author[-1])
-            if test and firstname is not None:
-                test = (firstname == author[0])
-            if test and othername is not None:
-                # Assume the match fails unless a match is found
-                test = False
+        last, first, other, any_ = self._name_index()
+        # Intersect the author positions that satisfy each name part test
+        candidates = None
+        for name, table in ((lastname, last), (firstname, first), 
+                (othername, other), (anyname, any_)):
+            if name is not None:
+                match = table.get(name, frozenset())
+                candidates = match if candidates is None else candidates & match
+                if not candidates:
+                    return -1
+        if candidates is None:
+            return 0 if self.names else -1
+        return min(candidates)
+        
+    def _name_index(self):
+        """Build the name part index used by hasauthor()
+    last, first, other, any_ = al._name_index()
+
+Each is a dict mapping a name part string to the set of author positions where
+it appears in that role.  The any_ dict covers every name part.  The index is 
+built on the first call and kept on the instance after that."""
+        index = self._index
+        if index is None:
+            last = {}
+            first = {}
+            other = {}
+            any_ = {}
+            for position, author in enumerate(self.names):
+                if not author:
+                    continue
+                last.setdefault(author[-1], set()).add(position)
+                first.setdefault(author[0], set()).add(position)
                 for name in author[1:-1]:
-                    if othername == name:
-                        test = True
-                        break
-            if test and anyname is not None:
-                # Assume the match fails unless a match is found
-                test = False
+                    other.setdefault(name, set()).add(position)
                 for name in author:
-                    if othername == name:
-                        test = True
-                        break
-            if test:
-                return index
-        return -1
+                    any_.setdefault(name, set()).add(position)
+            index = (last, first, other, any_)
+            self._index = index
+        return index
+
 
+# The (normal, italic, bold) markers used by the write_txt() methods
+_TXT_PLAIN = ('', '', '')
+_TXT_POSIX = ('\033[0m', '\033[3m', '\033[1m')
 
+@total_ordering
 class Entry:
     """Parent Eikosi entry class
 pbe = Entry(name)
@@ -705,6 +901,15 @@ to the format function used to construct the output.
 --> OutputHandler
 Output handlers are used to condition the item data for output to a bibtex 
 
+** The convert tuple **
+
+The convert tuple is another class attribute.  Its elements are 
+    (itemname, dtype)
+pairs, and Entry.post() runs _convert(itemname, dtype, fatal) for each of them
+in order.  Subclasses that only need their items converted to the right data
+types (e.g. the year to an int or the author to an AuthorList) do not need to 
+define a post() method of their own.
+
 ** The default member **
 Like the mandatory and optional member lists, the default list is a static 
 attribute that resides in the parent class (and not the instance).  It defines
@@ -715,7 +920,17 @@ It must be of the form
 """
     mandatory = set()
     optional = set()
+    convert = ()
     tag = None
+    _known = frozenset()
+    _bibhead = f'{tag}{{'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every item the class recognizes; built once per class for post()
+        cls._known = frozenset(cls.mandatory | cls.optional)
+        # The opening of the class's BibTeX entries, e.g. "@ARTICLE{"
+        cls._bibhead = f'{cls.tag}{{'
 
     def __init__(self, name):
         if not isinstance(name, str):
@@ -731,48 +946,53 @@ It must be of the form
     def __str__(self):
         f = io.StringIO()
         self.write_txt(target=f, posix=True, width=80)
-        f.seek(0)
-        return f.read()
+        return f.getvalue()
         
     def __repr__(self):
         thisclass = self.__class__.__name__
         return f'{thisclass}({repr(self.name)})'
 
     def __lt__(self, other):
-        if not issubclass(type(other), Entry):
-            raise Exception('Entry.__lt__: comparison is only allowed between entries.\n')
+        if not isinstance(other, Entry):
+            return NotImplemented
         return self.name < other.name
 
     def __gt__(self, other):
-        if not issubclass(type(other), Entry):
-            raise Exception('Entry.__gt__: comparison is only allowed between entries.\n')
+        if not isinstance(other, Entry):
+            return NotImplemented
         return self.name > other.name
 
     def __eq__(self, other):
-        if not issubclass(type(other), Entry):
-            raise Exception('Entry.__eq__: comparison is only allowed between entries.\n')
+        if not isinstance(other, Entry):
+            return NotImplemented
         return self.name == other.name
+
+    # Entries are equal when their names are, so they hash by name too
+    def __hash__(self):
+        return hash(self.name)
         
     def __getattr__(self, item):
-        # Test for existence of the key in dict first, then bib
-        # The hard attributes always take precedence over the bib entries
-        if item in self.__dict__:
-            return self.__dict__[item]
-        elif item in self.__dict__['bib']:
+        # This is only called once the normal attribute lookup has failed,
+        # so the hard attributes in the instance dict have already been 
+        # ruled out and only the bib entries are left.  bib is missing while
+        # an entry is being unpickled, and pickle probes for __setstate__ 
+        # before the instance dict is restored.
+        try:
             return self.__dict__['bib'][item]
-        raise AttributeError(item)
+        except KeyError:
+            raise AttributeError(item) from None
         
     def __setattr__(self, item, value):
         # Test for existence of the key in dict first, then bib
         # The hard attributes always take precedence over the bib entries
-        # Deny is a list of attributes that are off-limits for writing.
-        deny = ['bib']
-        if item in self.__dict__:
-            if item in deny:
+        # bib itself is off-limits for writing.
+        attrs = self.__dict__
+        if item in attrs:
+            if item == 'bib':
                 raise Exception(f'Entry: Permission denied to write to attribute {item}')
-            self.__dict__[item] = value
+            attrs[item] = value
         else:
-            self.bib[item] = value
+            attrs['bib'][item] = value
             
     def __contains__(self, item):
         return item in self.__dict__ or item in self.__dict__['bib']
@@ -783,18 +1003,38 @@ value = _convert(item, dtype, fatal)
 
 item is the item to be converted, dtype is the function or class to perform the
 conversion, and fatal should be True or False to specify what should be done in 
-the event of an error."""
-        if item in self.bib:
+the event of an error.  Items that already have exactly the target type (e.g.
+an entry that is being posted a second time) are left alone."""
+        bib = self.bib
+        value = bib.get(item, _MISS)
+        if value is not _MISS and type(value) is not dtype:
             try:
-                self.bib[item] = dtype(self.bib[item])
-            except:
-                sys.stderr.write(f'Entry._convert: Unsupported format for {item} in entry {self.name}\n')
+                bib[item] = dtype(value)
+            except Exception:
+                msg = f'Entry._convert: Unsupported format for {item} in entry {self.name}\n'
                 if self.sourcefile:
-                    sys.stderr.write(f'Entry._convert: loaded from file: {self.sourcefile}\n')
+                    msg += f'Entry._convert: loaded from file: {self.sourcefile}\n'
+                sys.stderr.write(msg)
                 if fatal:
-                    raise sys.exc_info()[1]
+                    raise
                     
                     
+    def _items(self, *items):
+        """Return the text of each of the listed items that the entry has
+    parts = self._items('publisher', 'address')
+
+Items that are absent are skipped, and the rest are returned as a list of 
+str() values in the order requested.  Each item is a single probe of the bib
+dict, so the write_txt() methods can use this in place of testing for an item 
+and then reading it."""
+        bib = self.bib
+        out = []
+        for item in items:
+            value = bib.get(item, _MISS)
+            if value is not _MISS:
+                out.append(str(value))
+        return out
+        
     def _date(self, yearfmt='', normal=''):
         """Build a date from the month, day, and year items
 The optional keywords, yearfmt and normal insert formatting text before and 
@@ -802,15 +1042,17 @@ after the year.
     {month} {day}, {yearfmt}{year}{normal}
 The intent is that a posix formatting characters can be inserted to force a bold
 year.  By default, they are empty strings."""
+        # Read the items straight from bib rather than through __getattr__
+        bib = self.bib
         out = ''
-        if 'year' in self:
-            if 'month' in self:
-                if 'day' in self:
-                    out += f'{self.month.show()} {self.day}, '
+        if 'year' in bib:
+            if 'month' in bib:
+                if 'day' in bib:
+                    out += f'{bib["month"].show()} {bib["day"]}, '
                 else:
-                    out += f'{self.month.show()}, '
+                    out += f'{bib["month"].show()}, '
 
-            out += f'{yearfmt}{self.year}{normal}'
+            out += f'{yearfmt}{bib["year"]}{normal}'
         return out
 
     def post(self, fatal=False, verbose=False, strict=False):
@@ -820,51 +1062,55 @@ year.  By default, they are empty strings."""
 This prototype post entry is intended to be called by subclass entries.  It 
 (1) checks for absent mandatory items
 (2) checks for unrecognized items (if strict)
+(3) converts the items listed in the class's convert tuple
 
-Individual subclasses should additionally implement checks on data integrity,
-perform any necessary data conversions (e.g. a string to an integer or vice 
-versa) to respect mandatory data types.
+Individual subclasses should additionally implement checks on data integrity.
+Data conversions (e.g. a string to an integer or vice versa) that respect the
+mandatory data types belong in the convert tuple.
     
 fatal   When True, causes post to raise an error if some aspect of the data 
         record is incorrect.
 verbose When True, post may print summary information to stdout
 strict  When True, unrecognized parameters should generate an error message.
 """
-        # Test for available bibliographic items
-        kk = set(self.bib.keys())
+        # Test for available bibliographic items.  The keys view already
+        # behaves like a set.
+        kk = self.bib.keys()
         # Are there any missing that are required?
         missing = self.mandatory - kk
         # Are there any that aren't recognized?
-        unknown = kk - self.mandatory
-        unknown -= self.optional
+        unknown = kk - self._known
         err = len(missing) + (len(unknown) if strict else 0)
+        # Collect the error messages and write them all at once
+        msgs = []
         for item in missing:
-            sys.stderr.write(f'Entry.post: Missing mandatory item {item}\n')
+            msgs.append(f'Entry.post: Missing mandatory item {item}\n')
         if strict:
             for item in unknown:
-                sys.stderr.write(f'Entry.post: Unrecognized item {item}\n')
+                msgs.append(f'Entry.post: Unrecognized item {item}\n')
         
         # Test the non-bibliographic items
         # Collections must be a list of strings
         if not isinstance(self.collections, list):
             err += 1
-            sys.stderr.write(f'Entry.post: The collection attribute must be a list of strings.\n')
-        elif any([not isinstance(this,str) for this in self.collections]):
+            msgs.append(f'Entry.post: The collection attribute must be a list of strings.\n')
+        elif any(not isinstance(this,str) for this in self.collections):
             err += 1
-            sys.stderr.write(f'Entry.post: The collection attribute must be a list of strings.\n')
+            msgs.append(f'Entry.post: The collection attribute must be a list of strings.\n')
         # Force the docfile to be a string.  Leave valid path testing to the load() algorithm
         elif not isinstance(self.docfile,str):
             err += 1
-            sys.stderr.write(f'Entry.post: The docfile attribute must be a string path to a file.\n')
+            msgs.append(f'Entry.post: The docfile attribute must be a string path to a file.\n')
         # Force doc to be a string.
         elif not isinstance(self.doc,str):
             err += 1
-            sys.stderr.write(f'Entry.post: The doc attribute must be a string.\n')            
+            msgs.append(f'Entry.post: The doc attribute must be a string.\n')            
         
         if err:
-            sys.stderr.write(f'Entry.post: Found {err} errors in {self.tag} entry {self.name}\n')
+            msgs.append(f'Entry.post: Found {err} errors in {self.tag} entry {self.name}\n')
             if self.sourcefile:
-                sys.stderr.write(f'Entry.post: defined in source file: {self.sourcefile}\n')
+                msgs.append(f'Entry.post: defined in source file: {self.sourcefile}\n')
+            sys.stderr.write(''.join(msgs))
             
         if err and fatal:
             raise Exception('Entry.post')
@@ -873,6 +1119,11 @@ strict  When True, unrecognized parameters should generate an error message.
             sys.stdout.write(f'Read in entry {self.name} of type {str(type(self))}\n')
             if self.sourcefile:
                 sys.stdout.write(f'from file {self.sourcefile}\n')
+
+        # Convert the items to their data types
+        convert = self._convert
+        for item, dtype in self.convert:
+            convert(item, dtype, fatal)
              
         
         
@@ -914,7 +1165,7 @@ WARNING: items with data for which the repr() function does not produce Python
 code defining the data will cause problems.  Classes that need to store such 
 data should define their own write() method.
 """
-        if isinstance(target,str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write(target=ff, addimport=addimport, varname=varname, module=module)
 
@@ -922,34 +1173,37 @@ data should define their own write() method.
         thisclass = self.__class__.__name__
         thismodule = self.__class__.__module__
         
+        # Build the lines in a list and hand them to the target all at once
+        lines = []
         # Add a line importing the module
         if addimport:
             if module is not None:
-                target.write(f'import {thismodule} as {module}\n\n')
+                lines.append(f'import {thismodule} as {module}\n\n')
             else:
-                target.write(f'import {thismodule}\n\n')
+                lines.append(f'import {thismodule}\n\n')
             
         # If the module name was not explicitly defined, use the full name
         if module is None:
             module = thismodule
         # Add a line declaring the entry variable
-        target.write(f'{varname} = {module}.{thisclass}({repr(self.name)})\n')
+        lines.append(f'{varname} = {module}.{thisclass}({self.name!r})\n')
         
         # Start with bibliographic items
         for item,value in self.bib.items():
             # if the value is an eikosi value class, prepend the module name
             if isinstance(value, (Month, AuthorList)):
-                target.write(f'{varname}.{item} = {module}.{repr(value)}\n')
+                lines.append(f'{varname}.{item} = {module}.{value!r}\n')
             else:
-                target.write(f'{varname}.{item} = {repr(value)}\n')
+                lines.append(f'{varname}.{item} = {value!r}\n')
         
         if self.collections:
-            target.write(f'{varname}.collections = {repr(self.collections)}\n')
+            lines.append(f'{varname}.collections = {self.collections!r}\n')
         if self.docfile:
-            target.write(f'{varname}.docfile = {repr(self.docfile)}\n')
+            lines.append(f'{varname}.docfile = {self.docfile!r}\n')
         if self.doc:
-            target.write(f'{varname}.doc = """{self.doc}"""\n')
-        target.write('\n')
+            lines.append(f'{varname}.doc = """{self.doc}"""\n')
+        lines.append('\n')
+        target.writelines(lines)
         
         
     def write_bib(self, target=sys.stdout):
@@ -972,14 +1226,16 @@ WARNING: items with data for which the str() function does not produce an output
 that can be parsed by BibTeX will cause errors.  Classes that support such data
 should define their own write_bib() method.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
-                return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
+                return self.write_bib(target=ff)
         
-        target.write(f'{self.tag}{{{self.name},\n')
+        # Assemble the whole entry and write it once
+        parts = [f'{self._bibhead}{self.name},\n']
         for item,value in self.bib.items():
-            target.write(f'  {item} = {{{value}}},\n')
-        target.write('}\n')
+            parts.append(f'  {item} = {{{value}}},\n')
+        parts.append('}\n')
+        target.write(''.join(parts))
         
         
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
@@ -996,34 +1252,43 @@ placeholder method that does nothing.
     def _splitlines(self, raw, width):
         """Split a string by whitespace and insert newlines as necessary to ensure each 
 line is no longer than WIDTH characters long.
+"""
+        # End with a single newline
+        return '\n'.join(self._iterlines(raw, width)) + '\n'
+        
+    def _iterlines(self, raw, width):
+        """Iterate over the lines of a string wrapped to WIDTH characters
+    for line in self._iterlines(raw, width):
+        ...
+
+This is the generator behind _splitlines().  The lines are yielded without 
+their newline characters, and paragraphs (separated by a blank line in raw) 
+are separated by an empty line.  Only one line is held at a time, so long 
+text can be written out without first building the whole wrapped string.
 """
         first = True
-        out = ''
-        raw_split = raw.split('\n\n')
-        for paragraph in raw_split:
-            # If this is the first paragraph
+        for paragraph in raw.split('\n\n'):
+            # Separate the paragraphs with a blank line
             if first:
                 first = False
             else:
-                out += '\n\n'
-            # Construct the lines
+                yield ''
+            line = []
             linelength = 0
             for word in paragraph.split():
                 wordlength = len(word)
-                # If this is the first word of the paragraph
-                if linelength == 0:
+                # If this is the first word of the line
+                if not line:
                     linelength = wordlength
-                    out += word
                 else:
                     linelength += wordlength + 1
                     if linelength > width:
+                        yield ' '.join(line)
+                        line = []
                         linelength = wordlength
-                        out += '\n' + word
-                    else:
-                        out += ' ' + word
-        # End with a single newline
-        out += '\n'
-        return out
+                line.append(word)
+            # An empty paragraph is still an (empty) line
+            yield ' '.join(line)
                 
 
 ###
@@ -1039,6 +1304,7 @@ e = ArticleEntry(name)
     tag = '@ARTICLE'
     mandatory = {'author', 'title', 'journal', 'year', 'pages'}
     optional = {'volume', 'number', 'month'}
+    convert = (('author', AuthorList), ('volume', int), ('number', int), ('month', Month), ('year', int))
 
     def post(self, fatal=False, verbose=False, strict=False):
         """Post processing on entry objects.
@@ -1053,19 +1319,13 @@ format.
         err = False
         # Either volume or number should be present
         if 'volume' not in self.bib and 'number' not in self.bib:
-            sys.stderr.write(f'ArticleEntry.post: No volume or number item in entry {self.name}\n')
+            msg = f'ArticleEntry.post: No volume or number item in entry {self.name}\n'
             if self.sourcefile:
-                sys.stderr.write(f'ArticleEntry.post: defined in file: {self.sourcefile}\n')
+                msg += f'ArticleEntry.post: defined in file: {self.sourcefile}\n'
+            sys.stderr.write(msg)
             if fatal:
                 raise Exception('ArticleEntry.post')
         
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('volume', int, fatal)
-        self._convert('number', int, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        
         
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
@@ -1087,29 +1347,24 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
         # First, assemble a string from the volume and number
         vn = ''
-        if 'volume' in self:
-            if 'number' in self:
-                vn = f'{bold}{self.volume}{normal}({self.number})'
+        if 'volume' in bib:
+            if 'number' in bib:
+                vn = f'{bold}{bib["volume"]}{normal}({bib["number"]})'
             else:
-                vn = f'{bold}{self.volume}{normal}'
-        elif 'number' in self:
-            vn = f'{bold}{self.number}{normal}'
+                vn = f'{bold}{bib["volume"]}{normal}'
+        elif 'number' in bib:
+            vn = f'{bold}{bib["number"]}{normal}'
         # Assemble the entire entry
-        out = f'{self.author.show()}, {self.title}, {italic}{self.journal}{normal}, {vn}, {self.pages}, {self._date()}.\n'
+        out = f'{bib["author"].show()}, {bib["title"]}, {italic}{bib["journal"]}{normal}, {vn}, {bib["pages"]}, {self._date()}.\n'
         if doc and self.doc:
             out += self.doc
         # Adjust the line width?
@@ -1123,20 +1378,7 @@ class BookEntry(Entry):
     tag = '@BOOK'
     mandatory = {'author', 'title', 'publisher', 'year', 'address'}
     optional = {'edition'}
-        
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('year', int, fatal)
+    convert = (('author', AuthorList), ('year', int))
 
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
@@ -1158,23 +1400,18 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
         # Assemble the entire entry
-        out = f'{self.author.show()}, {italic}{self.title}{normal}'
-        if 'edition' in self:
-            out += f', {self.edition}'
-        out += f', {self.publisher}, {self.address}, {self._date(yearfmt=bold, normal=normal)}.\n'
+        parts = [bib['author'].show(), f'{italic}{bib["title"]}{normal}']
+        parts += self._items('edition')
+        parts += [str(bib['publisher']), str(bib['address']), self._date(yearfmt=bold, normal=normal)]
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1191,22 +1428,7 @@ e = ConferenceEntry(name)
     tag = '@INPROCEEDINGS'
     mandatory = {'author', 'title', 'booktitle', 'year'}
     optional = {'address', 'series', 'pages', 'publisher', 'month', 'day'}
-
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('year', int, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('day', int, fatal)
+    convert = (('author', AuthorList), ('year', int), ('month', Month), ('day', int))
 
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
@@ -1228,29 +1450,18 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
         # Assemble the entire entry
-        out = f'{self.author.show()}, {self.title}, {italic}{self.booktitle}{normal}'
-        if 'publisher' in self:
-            out += f', {self.publisher}'
-        if 'series' in self:
-            out += f', {self.series}'
-        if 'address' in self:
-            out += f', {self.address}'
-        if 'pages' in self:
-            out += f', {self.pages}'
-        out += f', {self.address}, {self._date(yearfmt=bold, normal=normal)}.\n'
+        parts = [bib['author'].show(), str(bib['title']), f'{italic}{bib["booktitle"]}{normal}']
+        parts += self._items('publisher', 'series', 'address', 'pages')
+        parts.append(self._date(yearfmt=bold, normal=normal))
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1269,21 +1480,7 @@ e = ManualEntry(name)
     tag = '@MANUAL'
     mandatory = {'title', 'organization', 'year'}
     optional = {'author', 'address'}
-
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('year', int, fatal)
+    convert = (('author', AuthorList), ('year', int))
 
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
@@ -1305,26 +1502,21 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
-        out = ''
         # Assemble the entire entry
-        if 'author' in self:
-            out += f'{self.author.show()}, '
-        out += f'{italic}{self.title}{normal}, {self.organization}, '
-        if 'address' in self:
-            out += f'{self.address}, '
-        out += f'{self._date()}.\n'
+        parts = []
+        if 'author' in bib:
+            parts.append(bib['author'].show())
+        parts += [f'{italic}{bib["title"]}{normal}', str(bib['organization'])]
+        parts += self._items('address')
+        parts.append(self._date())
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1341,23 +1533,8 @@ e = MastersEntry(name)
     tag = '@MASTERSTHESIS'
     mandatory = {'author', 'title', 'school', 'year'}
     optional = {'address', 'month', 'day'}
-    
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
+    convert = (('author', AuthorList), ('month', Month), ('year', int), ('day', int))
 
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        self._convert('day', int, fatal)
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1378,24 +1555,19 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
-        
-        out = f'{self.author.show()}, {italic}{self.title}{normal}, {self.school}, '
-        if 'address' in self:
-            out += f'{self.address}, '
-        if 'month' in self:
-            out += f'{self.month.show()}, '
-        out += f'{self._date(yearfmt=bold, normal=normal)}.\n'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
+        
+        parts = [bib['author'].show(), f'{italic}{bib["title"]}{normal}', str(bib['school'])]
+        parts += self._items('address')
+        if 'month' in bib:
+            parts.append(bib['month'].show())
+        parts.append(self._date(yearfmt=bold, normal=normal))
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1409,23 +1581,8 @@ class MiscEntry(Entry):
     tag = '@MISC'
     mandatory = {'title', 'howpublished', 'year'}
     optional = {'note', 'author', 'month', 'day'}
-    
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
+    convert = (('author', AuthorList), ('month', Month), ('year', int), ('day', int))
 
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        self._convert('day', int, fatal)
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1446,27 +1603,23 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
-        
-        out = ''
-        if 'author' in self:
-            out += f'{self.author.show()}, '
-        out += f'{italic}{self.title}{normal}, {self.howpublished}, '
-        if 'year' in self:
-            out += f'{self._date(yearfmt=bold,normal=normal)}.'
-        if 'note' in self:
-            out += f' {self.note}'
-        out += '\n'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
+        
+        parts = []
+        if 'author' in bib:
+            parts.append(f'{bib["author"].show()}, ')
+        parts.append(f'{italic}{bib["title"]}{normal}, {bib["howpublished"]}, ')
+        if 'year' in bib:
+            parts.append(f'{self._date(yearfmt=bold,normal=normal)}.')
+        if 'note' in bib:
+            parts.append(f' {bib["note"]}')
+        parts.append('\n')
+        out = ''.join(parts)
             
         if doc and self.doc:
             out += self.doc
@@ -1480,23 +1633,8 @@ class PhdEntry(Entry):
     tag = '@PHDTHESIS'
     mandatory = {'author', 'title', 'school', 'year'}
     optional = {'address', 'month', 'day'}
+    convert = (('author', AuthorList), ('month', Month), ('year', int), ('day', int))
 
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        self._convert('day', int, fatal)
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1517,24 +1655,19 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
-        
-        out = f'{self.author.show()}, {italic}{self.title}{normal}, {self.school}, '
-        if 'address' in self:
-            out += f'{self.address}, '
-        if 'month' in self:
-            out += f'{self.month.show()}, '
-        out += f'{self._date(yearfmt=bold,normal=normal)}.\n'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
+        
+        parts = [bib['author'].show(), f'{italic}{bib["title"]}{normal}', str(bib['school'])]
+        parts += self._items('address')
+        if 'month' in bib:
+            parts.append(bib['month'].show())
+        parts.append(self._date(yearfmt=bold, normal=normal))
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1551,22 +1684,8 @@ e = ReportEntry(name)
     tag = '@TECHREPORT'
     mandatory = {'author', 'title', 'year'}
     optional = {'number', 'institution', 'month', 'day', 'address'}
+    convert = (('author', AuthorList), ('month', Month), ('year', int))
 
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1587,22 +1706,17 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
-        out = f'{self.author.show()}, {italic}{self.title}{normal}, {self.institution}, '
-        if 'address' in self:
-            out += f'{self.address}, '
-        out += f'{self._date(yearfmt=bold,normal=normal)}.\n'
+        parts = [bib['author'].show(), f'{italic}{bib["title"]}{normal}', str(bib['institution'])]
+        parts += self._items('address')
+        parts.append(self._date(yearfmt=bold, normal=normal))
+        out = ', '.join(parts) + '.\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1622,25 +1736,8 @@ e = PatentEntry(name)
     tag = '@MISC'
     mandatory = {'author', 'title', 'number', 'year'}
     optional = {'assignee', 'nationality', 'month', 'day'}
-    
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
+    convert = (('author', AuthorList), ('month', Month), ('year', int), ('number', str), ('day', int))
 
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        self._convert('number', str, fatal)
-        self._convert('day', int, fatal)
-        
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1661,22 +1758,17 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
-        out = f'{self.author.show()}, {italic}{self.title}{normal}, '
-        if 'nationality' in self:
-            out += f'{self.nationality} '
-        out += f'Pat. {bold}{self.number:,d}{normal}, {self._date()}.'
+        out = f'{bib["author"].show()}, {italic}{bib["title"]}{normal}, '
+        if 'nationality' in bib:
+            out += f'{bib["nationality"]} '
+        out += f'Pat. {bold}{bib["number"]:,d}{normal}, {self._date()}.'
         
         if doc and self.doc:
             out += self.doc
@@ -1706,15 +1798,16 @@ WARNING: items with data for which the str() function does not produce an output
 that can be parsed by BibTeX will cause errors.  Classes that support such data
 should define their own write_bib() method.
 """
+        bib = self.bib
         # Build a miscellaneous entry
         e = MiscEntry(self.name)
-        e.author = self.author
-        if 'nationality' in self:
-            e.howpublished = f'{self.nationality} Patent {self.number}'
+        e.author = bib['author']
+        if 'nationality' in bib:
+            e.howpublished = f'{bib["nationality"]} Patent {bib["number"]}'
         else:
-            e.howpublished = f'Patent {self.number}'
-        e.year = self.year
-        e.title = self.title
+            e.howpublished = f'Patent {bib["number"]}'
+        e.year = bib['year']
+        e.title = bib['title']
         e.write_bib(target=target)
     
 # CUSTOM WEBSITE ENTRY
@@ -1722,24 +1815,8 @@ class WebsiteEntry(Entry):
     tag = '@MISC'
     mandatory = {'url', 'year', 'month'}
     optional = {'title', 'author', 'institution', 'day'}
+    convert = (('author', AuthorList), ('month', Month), ('year', int), ('day', int))
 
-    def post(self, fatal=False, verbose=False, strict=False):
-        """Post processing on entry objects.
-    e.post(fatal=False, verbose=False, strict=False)
-
-The post() method on each entry is run by a MasterColleciton's load() method
-when reading entries into the collection.  It checks the entry for data type and
-format.
-"""
-        # Check for mandatory and/or unrecognized items in the entry
-        Entry.post(self, fatal=fatal, verbose=verbose, strict=strict)
-        # Force the authors to be an AuthorList item
-        self._convert('author', AuthorList, fatal)
-        self._convert('month', Month, fatal)
-        self._convert('year', int, fatal)
-        self._convert('day', int, fatal)
-        
-        
     def write_txt(self, target=sys.stdout, doc=True, width=None, posix=False):
         """Return a string appropriate for printing to a terminal
     write_txt()
@@ -1760,29 +1837,23 @@ width   If width is set to an integer, it will determine the maximum line length
 posix   If True, posix terminal formatting escape characters will be inserted
         for bold and italic fonts where appropriate.
 """
-        if isinstance(target, str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.write_txt(target=ff, doc=doc, width=width, posix=posix)
         
-        normal = ''
-        italic = ''
-        bold = ''
-        if posix:
-            normal = '\033[0m'
-            italic = '\033[3m'
-            bold = '\033[1m'
+        normal, italic, bold = _TXT_POSIX if posix else _TXT_PLAIN
+        bib = self.bib
         
-        out = ''
-        if 'author' in self:
-            out += f'{self.author.show()}, '
-        if 'title' in self:
-            out += f'{italic}{self.title}{normal}, '
-        if 'institution' in self:
-            out += f'{self.institution}, '
-        out += f'{bold}{self.url}{normal}'
-        if 'year' in self:
-            out += f', accessed: {self._date()}'
-        out += '\n'
+        parts = []
+        if 'author' in bib:
+            parts.append(bib['author'].show())
+        if 'title' in bib:
+            parts.append(f'{italic}{bib["title"]}{normal}')
+        parts += self._items('institution')
+        parts.append(f'{bold}{bib["url"]}{normal}')
+        if 'year' in bib:
+            parts.append(f'accessed: {self._date()}')
+        out = ', '.join(parts) + '\n'
         
         if doc and self.doc:
             out += self.doc
@@ -1811,22 +1882,28 @@ WARNING: items with data for which the str() function does not produce an output
 that can be parsed by BibTeX will cause errors.  Classes that support such data
 should define their own write_bib() method.
 """
+        bib = self.bib
         # Build a miscellaneous entry
         e = MiscEntry(self.name)
-        if 'title' in self:
-            e.title = self.title
-        if 'author' in self:
-            e.author = self.author
-        if 'institution' in self:
-            e.howpublished = f'{self.institution}, {self.url}'
+        if 'title' in bib:
+            e.title = bib['title']
+        if 'author' in bib:
+            e.author = bib['author']
+        if 'institution' in bib:
+            e.howpublished = f'{bib["institution"]}, {bib["url"]}'
         else:
-            e.howpublished = self.url
+            e.howpublished = bib['url']
         e.note = f'accessed: {self._date()}'
         e.write_bib(target=target)
 
 #####
 # Collection and collection-related classes
 #####
+#   The collection methods (list, write, savebib, load, save) are dominated by
+#   string handling, dict lookups, and file I/O.  They are deliberately NOT
+#   JIT-compiled.  Numba can only run this kind of code in object mode, which
+#   is slower than the plain interpreter.  Efforts at speeding them up should
+#   go toward str.join(), buffered io writes, and prebuilt indexes instead.
 
 class CollectionIterator:
     """Use the CollectionIterator to iterate over all child Collections
@@ -1851,64 +1928,46 @@ When True, the iteration recurses into the children of children.
 """
     def __init__(self, target, depthfirst = False, inclusive=True, deep=True):
         self.target = target
-        self.schedule = []
+        # The schedule is consumed from the front, so keep it in a deque
+        self.schedule = deque()
         # shallow operation is easier, so knock that out first
         if not deep :
             # First check that at least inclusive or deep is set.
             if not inclusive:
                 raise Exception('CollectionIterator: Cannot iterate neither inclusively or deeply; pick at least one.')
-            self.schedule = list(target._children.values())
+            self.schedule = deque(target._children.values())
             return
             
-        # As a test for tree integrity, keep track of each unique collection
-        # Each time the _iflag of a new collection is set, increment count.
-        count = 0
+        # The collections already scheduled are tracked by id() in local 
+        # sets, so nothing is written to the collections themselves and
+        # concurrent or nested iterations do not interfere.
         if depthfirst:
-            count = self._depth_first(target, count)
+            self._depth_first(target, set())
             if not inclusive:
                 del self.schedule[-1]
         else:
-            # Deal with target first.
-            target._iflag = True
-            count += 1
-            if inclusive:
-                self.schedule.append(target)
-            count = self._depth_last(target, count)
-        iflag_count = target._set_iflag(False)
-        if count != iflag_count:
-            sys.stderr.write(f'CollectionIterator: Counted value is inconsistent with measured length, count={count}, len={iflag_count}\n')
-            raise Exception('CollectionIterator: There was an irregularity in the _iflag state of the collections.\n')
+            # The walk starts with target itself
+            self.schedule = deque(target._walk())
+            if not inclusive:
+                self.schedule.popleft()
             
     def __iter__(self):
         return self
         
     def __list__(self):
-        return self.schedule
-        
-    def _depth_last(self, target, count):
-        """Accumulate children in a depth-last ordered list"""
-        for child in target._children.values():
-            if not child._iflag:
-                child._iflag = True
-                count += 1
-                self.schedule.append(child)
-        for child in target._children.values():
-            count = self._depth_last(child, count)
-        return count
-                
-    def _depth_first(self, target, count):
+        return list(self.schedule)
+        
+    def _depth_first(self, target, seen):
         """Accumulate children in a depth-first ordered list"""
-        if not target._iflag:
-            target._iflag = True
-            count += 1
+        if id(target) not in seen:
+            seen.add(id(target))
             for child in target._children.values():
-                count = self._depth_first(child, count)
+                self._depth_first(child, seen)
             self.schedule.append(target)
-        return count
         
     def __next__(self):
         if self.schedule:
-            return self.schedule.pop(0)
+            return self.schedule.popleft()
         raise StopIteration
 
 
@@ -1951,30 +2010,28 @@ of Collections and other SubCollections.  This permits trees of Collection
 objects, and loops in the tree are permitted.
 
 """
-    # Name contains the string that uniquely identifies the collection
-    name = ''
-    # The doc string is a place for optional comments on the collection
-    doc = ''
-    # The entries that belong to the dict are all stored here
-    _entries = {}
-    # The Collections that belong to this collection are all stored here
-    _children = {}
-    # This is a pointer to the MasterCollection that contains this Collection
-    master = None
-    # This is a record of the file where the Collection was defined
-    sourcefile = None
-    # _sorted is a dict of all past calls to sort().  Each entry is a list of
-    # entry names sorted by the item identified by the key.
-    _sorted = {}
-    # The _iflag is a boolean indicating if this Collection was already used
-    # while assembling a CollectionIterator schedule.
-    _iflag = False
+    # The attributes of a collection are fixed, so they are declared as 
+    # slots rather than living in a per-instance __dict__.
+    #   name        The string that uniquely identifies the collection
+    #   doc         A place for optional comments on the collection
+    #   _entries    The entries that belong to the collection, by name
+    #   _children   The Collections that belong to this collection, by name
+    #   master      The MasterCollection that contains this Collection
+    #   sourcefile  A record of the file where the Collection was defined
+    #   _sorted     A dict of all past calls to sort().  Each entry is a list of
+    #               entries sorted by the item identified by the key.
+    __slots__ = ('name', 'doc', '_entries', '_children', 'master', 
+            'sourcefile', '_sorted')
 
     def __init__(self, name):
-        # Make explicit local attributes for the most essential elements.
+        # Slots have no class-level defaults, so every attribute must be
+        # initialized here.
         self.name = ''
+        self.doc = ''
         self._entries = {}
         self._children = {}
+        self.master = None
+        self.sourcefile = None
         self._sorted = {}
 
         if isinstance(name, ProtoCollection):
@@ -1992,40 +2049,71 @@ objects, and loops in the tree are permitted.
             raise TypeError('Collection.__init__: The collection name must be a string.\n')
         
     def __iter__(self):
-        for c in CollectionIterator(self, depthfirst=False):
-            for entry in c._entries.values():
-                yield entry
+        # Stream the entries while walking the tree rather than scheduling
+        # every collection first
+        for c in self._walk():
+            yield from c._entries.values()
                 
     def __getattr__(self, item):
-        if item in self.__dict__:
-            return self.__dict__[item]
-        elif item in self.__dict__['_children']:
-            return self.__dict__['_children'][item]
+        # This is only called once the normal attribute lookup has failed,
+        # so all that is left to check are the children.  Guard against an
+        # uninitialized _children slot to avoid infinite recursion.
+        if item != '_children':
+            child = self._children.get(item)
+            if child is not None:
+                return child
         raise AttributeError(item)
         
     def __repr__(self):
         return f'{self.__class__.__name__}(\'{self.name}\')'
         
-    def _set_iflag(self, value):
-        """Set the value of _iflag for this and all child Collections
-    count = c._set_iflag(value)
-    
-For each child Collection that does not already have its _iflag set to
-value, _set_iflag sets its _iflag value and recurses into its children as
-well.  _set_iflag() returns the total number of _iflag members whose 
-values were set.
+    def _walk(self):
+        """Iterate over this and all descendant Collections
+    for c in self._walk():
+        ...
+
+This yields the Collections in the same order as a CollectionIterator with 
+depthfirst=False, but it does not build a schedule.  The Collections that were
+already seen are kept in local sets, so _walk() may safely be abandoned part 
+way through (as get() and getchild() do when they find a match).  Loops in the
+tree are visited only once.
+"""
+        seen = {id(self)}
+        yield self
+        yield from self._walk_children(seen, set())
+        
+    def _walk_children(self, seen, descended):
+        """Recursive helper for _walk()"""
+        descended.add(id(self))
+        children = self._children.values()
+        for child in children:
+            if id(child) not in seen:
+                seen.add(id(child))
+                yield child
+        for child in children:
+            if id(child) not in descended:
+                yield from child._walk_children(seen, descended)
+        
+    def _unsort(self, keep=None):
+        """Discard the stored sort() results of this and all descendants
+    c._unsort()
+        OR
+    c._unsort(keep=c)
 
-This is a method for counting unique Collections in trees that can have
-infinite loops.  _set_iflag() is also useful for clearing _iflag values
-after an loop iteration is complete.
+The stored results of the collection passed as keep are left alone.  This 
+runs every time an entry is added or removed, so the tree is walked with a 
+plain stack rather than with _walk(), since the order does not matter.
 """
-        count = 0
-        if self._iflag != value:
-            count += 1
-            self._iflag = value
-            for child in self._children.values():
-                count += child._set_iflag(value)
-        return count
+        seen = {id(self)}
+        pending = [self]
+        while pending:
+            c = pending.pop()
+            if c._sorted and c is not keep:
+                c._sorted = {}
+            for child in c._children.values():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    pending.append(child)
         
     def flatten(self, remove=True):
         """Pull in entries from all children
@@ -2037,12 +2125,16 @@ Brings all entries from this collection's children into its dict of
 entries.  Unless the *remove* keyword is set to False, all child 
 collections will also be removed. 
 """
+        entries = self._entries
         for c in self.collections(rself=False):
             for newentry in c._entries.values():
-                # Check to see if this entry already belongs to self
-                if self not in newentry.collections:
-                    self._entries[newentry.name] = newentry
-                    newentry.collections.append(self)
+                # Check to see if this entry already belongs to self.  The
+                # entries are keyed by name, so this is a single lookup.
+                if newentry.name not in entries:
+                    entries[newentry.name] = newentry
+                    # Entries list their collections by name
+                    if self.name not in newentry.collections:
+                        newentry.collections.append(self.name)
         if remove:
             self._children = {}
             
@@ -2075,8 +2167,8 @@ provided.
             raise Exception(f'ProtoCollection.merge: There is already a Collection with the name: {name}')
             
         # Build sets of all collections and look for any intersection
-        old = set([this.name for this in master.collections(rself=False)])
-        new = set([this.name for this in mc.collections(rself=False)])
+        old = {this.name for this in master.collections(rself=False)}
+        new = {this.name for this in mc.collections(rself=False)}
         redundant = old.intersection(new)
         if redundant:
             sys.stderr.write('ProtoCollection.merge: Found conflicting collection names:\n    ')
@@ -2085,11 +2177,11 @@ provided.
             raise Exception('ProtoCollection.merge: Found conflicting collection names. Aborting.')
         
         # Test every new entry for a collision.  Redundant names are allowed
-        # if they point to identical entries.
-        for new in mc:
-            old = master._entries.get(new.name)
-            if old is not None and old is not new:
-                raise Exception(f'ProtoCollection.merge: Found conflicting entries for: {new.name}')
+        # if they point to identical entries, so only the names common to
+        # both masters need to be compared.
+        for name in mc._entries.keys() & master._entries.keys():
+            if mc._entries[name] is not master._entries[name]:
+                raise Exception(f'ProtoCollection.merge: Found conflicting entries for: {name}')
         
         # OK, the merge is safe.  Time to proceed.
         # Read in all the new entries
@@ -2108,13 +2200,13 @@ provided.
         # recursive iteration algorithm.
         # Keep track of every prior collection that has been demoted.
         record = {}
-        def _demote(target, count):
-            if not target._iflag:
+        visited = set()
+        def _demote(target):
+            if id(target) not in visited:
                 # Set the new master
                 target.master = master
                 # Record that we've worked on this collection already
-                target._iflag = True
-                count += 1
+                visited.add(id(target))
                 # Loop through the children of this collection
                 for n,c in target._children.items():
                     # If this child has not yet been demoted
@@ -2126,12 +2218,9 @@ provided.
                         # Demote it and replace it in the dictionary
                         target._children[n] = cc
                         c = cc
-                    count = _demote(c, count)
-            return count
+                    _demote(c)
             
-        if _demote(nc,0) != nc._set_iflag(False):
-            sys.stderr.write('ProtoCollection.merge: WARNING. There appears to be a corruption in the Collection tree.\n')
-            sys.stderr.write('ProtoCollection.merge: There was a child count missmatch while demoting to SubCollections.\n')
+        _demote(nc)
             
         # Add the collection
         self._children[name] = nc
@@ -2365,7 +2454,7 @@ This retrieve operation will succeed if the collection is a member of this or
 any of the sub-collections.  If the name is not found as a child of the evoking
 collection, then getchild() returns None.
 """
-        for this in CollectionIterator(self, depthfirst=False):
+        for this in self._walk():
             if this.name == cname:
                 return this
         return None
@@ -2402,9 +2491,11 @@ done unless the entries are different.
         # Add the new entry to this collection
         self._entries[newentry.name] = newentry
         # Finally, adding a new entry invalidates previous sort operaitons
-        root = self.master if self.master else self
-        for c in root.collections():
-            c._sorted = {}
+        # A MasterCollection keeps its own sorted records up to date in add()
+        if self.master:
+            self.master._unsort(keep=self.master)
+        else:
+            self._unsort()
         
         
     def remove(self, target, recurse=True, fatal=True):
@@ -2454,8 +2545,7 @@ were found matching the target.
             # records.
             if nfound > 0:
                 root = self.master if self.master else self
-                for c in root.collections():
-                    c._sorted = {}
+                root._unsort()
             # Raise an exception?
             if not fatal or nfound:
                 return nfound
@@ -2468,10 +2558,9 @@ were found matching the target.
                     raise Exception(f'ProtoCollection.remove: Entry {entryname} contradicts the entry.  Aborting.')
                 # Finally, remove the entry from the collection
                 del self._entries[entryname]
-                # Finally, adding a new entry invalidates previous sort operaitons
+                # Finally, removing an entry invalidates previous sort operaitons
                 root = self.master if self.master else self
-                for c in root.collections():
-                    c._sorted = {}
+                root._unsort()
                 return 1
             elif not fatal:
                 return 0
@@ -2491,7 +2580,7 @@ the deep keyword to False excludes this collection's children from the
 retrieval.  The entry must be a member of this collection.
 """
         if deep:
-            for this in CollectionIterator(self, depthfirst=False):
+            for this in self._walk():
                 value = this._entries.get(entryname)
                 if value is not None:
                     return value
@@ -2564,7 +2653,7 @@ False, the list will only include Entries that belong to this collection.
             schedule = self.sort(by)
         else:
             schedule = list(self._entries.values())
-            schedule.sort(key=lambda x: x.__getattr__(by))
+            schedule.sort(key=_sortkey(by))
             
         N = len(schedule)
         
@@ -2579,24 +2668,22 @@ False, the list will only include Entries that belong to this collection.
             Nrow = int(ceil(N / Ncol))  # number of rows
             Nfrow = Nrow * (1-Ncol) + N # Number of full rows
             
-            # Build a format string for printing the names
-            fmtstr = '{:' + str(colwidth) + 's}'
-            # Loop through the full rows
+            # Loop through the full rows; pad each name to the column width
             for row in range(Nfrow):
                 for col in range(Ncol):
-                    sys.stdout.write(fmtstr.format(schedule[row + Nrow*col].name))
+                    sys.stdout.write(f'{schedule[row + Nrow*col].name:{colwidth}s}')
                 sys.stdout.write('\n')
             # End up with the rows that are missing the right-most name
             for row in range(Nfrow,Nrow):
                 for col in range(Ncol-1):
-                    sys.stdout.write(fmtstr.format(schedule[row + Nrow*col].name))
+                    sys.stdout.write(f'{schedule[row + Nrow*col].name:{colwidth}s}')
                 sys.stdout.write('\n')
         else:
             for thisentry in schedule:
                 sys.stdout.write(thisentry.name + '\n')
         
         
-    def listchildren(self, deep=True, _indlvl=''):
+    def listchildren(self, deep=True, _indlvl='', _shown=None):
         """Prints a formatted representation of the collection tree
     c.listchildren()
         OR
@@ -2617,10 +2704,13 @@ this collection will be listed.  Their children will not be displayed.
         if _indlvl and not deep:
             return
             
+        # The collections that have been explored, by id()
+        if _shown is None:
+            _shown = set()
         # If this collection hasn't already been explored
-        if not self._iflag:
+        if id(self) not in _shown:
             # Mark it
-            self._iflag = True
+            _shown.add(id(self))
             # and explore it
             # Detect the number of children so we can identify the last one
             # Modify the indentation level
@@ -2632,17 +2722,14 @@ this collection will be listed.  Their children will not be displayed.
                 sys.stdout.write(_indlvl)
                 if ii<nn:
                     sys.stdout.write('|-> ')
-                    c.listchildren(deep=deep, _indlvl=_indlvl + '|   ')
+                    c.listchildren(deep=deep, _indlvl=_indlvl + '|   ', _shown=_shown)
                 else:
                     sys.stdout.write("'-> ")
-                    c.listchildren(deep=deep, _indlvl=_indlvl + '    ')
+                    c.listchildren(deep=deep, _indlvl=_indlvl + '    ', _shown=_shown)
         # If this collection has already been displayed and it has children
         # just display a placeholder for the redundant display
         elif self._children:
             sys.stdout.write(_indlvl + "'-> ...\n")
-        # If this is the root of the recursion tree
-        if len(_indlvl) == 0:
-            self._set_iflag(False)
         
     def find(self, **kwarg):
         """Returns a collection of entries that match the search criteria
@@ -2681,12 +2768,7 @@ by sort(by, omit=True) will not be persistent.
         # If this sorting doesn't already exist in the _sorted record,
         # create it.
         if by not in self._sorted or refresh:
-            def _key(entry):
-                if by in entry:
-                    return entry.__getattr__(by)
-                return None
-            temp = sorted(self, key=_key)
-            self._sorted[by] = sorted(self, key=_key)
+            temp = sorted(self, key=_sortkey(by))
             # Deduplicate the list
             ii = 1
             n = len(temp)
@@ -2702,18 +2784,16 @@ by sort(by, omit=True) will not be persistent.
         # If the list needs to be modified, first make a copy
         if omit or not ascending:
             result = self._sorted[by].copy()
+            # The entries that do not have by are all at the end of the list
             # Search for the last result element that contains by
-            for index in range(len(result),-1,-1):
-                if by in result[index]:
-                    index += 1
-                    break
+            index = len(result)
+            while index and by not in result[index-1]:
+                index -= 1
             # index is now the first index where the entry does not have by
             if omit:
-                result = result[:index]
-                if not ascending:
-                    result = result.reverse()
-            elif not ascending:
-                result[:index] = result[:index].reverse()
+                del result[index:]
+            if not ascending:
+                result[:index] = reversed(result[:index])
             return result
         
         return self._sorted[by]
@@ -2723,11 +2803,12 @@ by sort(by, omit=True) will not be persistent.
         """Save the collection to an executable python file that is capable of re-defining it
     c.write('/path/to/file.eks')
 """
-        if isinstance(target,str):
+        if isinstance(target, _PATH):
+            target = os.fspath(target)
             if not target.endswith(EXT):
                 target += EXT
             with open(target,'w') as ff:
-                return self.save(ff, addimport=addimport, varname=varname)
+                return self.write(ff, addimport=addimport, varname=varname)
         elif not hasattr(target,'write'):
             raise TypeError('Collection.save: Arguments must be either a file descriptor or a path to a file.\n')
         
@@ -2735,11 +2816,13 @@ by sort(by, omit=True) will not be persistent.
         thisclass = self.__class__.__name__
         thismodule = self.__class__.__module__
         
+        # Build the header and write it all at once
+        out = f'{varname} = {thismodule}.{thisclass}({self.name!r})\n'
         if addimport:
-            target.write(f'import {thismodule}\n\n')
-        target.write(f'{varname} = {thismodule}.{thisclass}(\'{self.name}\')\n')
+            out = f'import {thismodule}\n\n' + out
         if self.doc:
-            target.write(f'{varname}.doc = {repr(self.doc)}\n')
+            out += f'{varname}.doc = {self.doc!r}\n'
+        target.write(out)
 
     def savebib(self, target):
         """Export the members of this collection to a BibTeX file
@@ -2747,7 +2830,7 @@ by sort(by, omit=True) will not be persistent.
         OR
     c.savebib(file_descriptor)
 """
-        if isinstance(target,str):
+        if isinstance(target, _PATH):
             with open(target,'w') as ff:
                 return self.savebib(ff)
         elif hasattr(target, 'write'):
@@ -2786,11 +2869,10 @@ This will loop over all SubCollections (including the parent, mycollection) in
 a depth-last order.  Using the CollectionIterator class, it is possible to 
 specify a depth-first approach instead.
 """
-    pass
+    __slots__ = ()
 
 class SubCollection(ProtoCollection):
-
-    pass
+    __slots__ = ()
 
 class MasterCollection(ProtoCollection):
     """MASTERCOLLECTION
@@ -2816,6 +2898,8 @@ MasterCollections, but it also means that any additions to child collections
 after load will not be detected unless they are handled by the appropraite
 class functions.  See update(), add(), addchild(), merge(),
 """
+    __slots__ = ()
+
     def __init__(self):
         # Use the standard initialization algorithm
         ProtoCollection.__init__(self, 'main')
@@ -2840,18 +2924,52 @@ conflicts with a prior entry, an Exception is raised.
         if not isinstance(newentry,Entry):
             raise Exception('MasterCollection.add: Cannot add a non-Entry: ' + repr(type(newentry)))
         # Check for a collision.  If it's safe, go ahead and add the entry
-        test = self.get(newentry.name)
+        # Go straight to the dict; get() is only a wrapper around it.
+        entries = self._entries
+        test = entries.get(newentry.name)
         # If there is no conflict, then we need to clear any prior sortings
         # and it is safe to add the new entry
         if test is None:
-            self._entries[newentry.name] = newentry
-            # This invalidates all previous sorted records for the Master only.
-            self._sorted = {}
+            entries[newentry.name] = newentry
+            # Rather than invalidating the previous sorted records, insert
+            # the new entry into them.  If the new entry's value can't be
+            # compared with the others, leave it to sort() to complain.
+            for by in list(self._sorted):
+                try:
+                    _insort(self._sorted[by], newentry, by)
+                except TypeError:
+                    del self._sorted[by]
         # If there is already an entry with this name make sure it doesn't
         # contradict the new entry, and exit gracefully.
         elif test is not newentry:
             raise Exception('MasterCollection.add: The new entry collides with an existing entry for: ' + newentry.name)
-        
+
+    def update(self, newentries):
+        """Add many entries to this MasterCollection at once
+    mc.update(newentries)
+
+newentries is any iterable of Entry instances.  The rules are the same as for
+add(), but every entry is checked before any of them are added, so either all
+of the entries are added or, if one is not an Entry or it collides with an
+existing entry, none of them are and an Exception is raised.
+
+This is much faster than calling add() in a loop.  Prior sortings are
+cleared once instead of being updated for every new entry.
+"""
+        entries = self._entries
+        batch = {}
+        for newentry in newentries:
+            if not isinstance(newentry,Entry):
+                raise Exception('MasterCollection.update: Cannot add a non-Entry: ' + repr(type(newentry)))
+            test = batch.setdefault(newentry.name, newentry)
+            if test is newentry:
+                test = entries.get(newentry.name, newentry)
+            if test is not newentry:
+                raise Exception('MasterCollection.update: The new entry collides with an existing entry for: ' + newentry.name)
+        if batch.keys() - entries.keys():
+            entries.update(batch)
+            self._sorted = {}
+
     def get(self, entryname, deep=True):
         """Get an entry that belongs to the MasterCollection
     E = mc.get('name_string')
@@ -2883,7 +3001,9 @@ keyword has no effect.
         if isinstance(entryname, str):
             return entryname in self._entries
         elif isinstance(entryname, Entry):
-            return self.get(entryname.name) is entryname
+            # Entries are unique by name, so one dict lookup and an identity
+            # test settle it
+            return self._entries.get(entryname.name) is entryname
         raise TypeError('MasterCollection.has: The argument must be a string or an Entry type.\n')
 
     def load(self, target, verbose=False, recurse=False, relax=False, create=True, _top=True):
@@ -2907,25 +3027,32 @@ Load entries and collections in a relaxed mode, so unrecongized entries do not
 cause the process to halt with an exception.
 
 """
-        # If called with a string
+        # If called with a string (or a path-like object)
+        if isinstance(target, os.PathLike):
+            target = os.fspath(target)
         if isinstance(target,str):
             # If the target is a directory, scan it for .eks files
             if os.path.isdir(target):
                 target = os.path.abspath(target)
-                contents = os.listdir(target)
-                # Loop over everything in the directory
-                for this in contents:
-                    newtarget = os.path.join(target, this)
-                    # If this is a directory and recursion is active
-                    if os.path.isdir(newtarget):
-                        if recurse:
+                # Work through the directory tree with an explicit stack of
+                # directory listings rather than a recursive load() call for 
+                # each.  Files and subdirectories are taken in the order the 
+                # directory lists them, and a subdirectory is loaded in full 
+                # before moving on, so the first of two conflicting 
+                # definitions is the same one a recursive walk would find.
+                pending = [iter(_listdir(target, recurse))]
+                while pending:
+                    for path, loaded in pending[-1]:
+                        # A subdirectory interrupts this listing until it is done
+                        if loaded is None:
                             if verbose:
-                                sys.stdout.write(f'MasterCollection.load: Recursing into dir: {newtarget}\n')
-                            # recurse into the directory
-                            self.load(newtarget, verbose=verbose, recurse=recurse, relax=relax, create=create, _top=False)
-                    # If this is an eks file, load it!
-                    elif this.endswith(EXT):
-                        self.load(newtarget, verbose=verbose, recurse=recurse, relax=relax, create=create, _top=False)
+                                sys.stdout.write(f'MasterCollection.load: Recursing into dir: {path}\n')
+                            pending.append(iter(_listdir(path, recurse)))
+                            break
+                        source, stamp = loaded
+                        self._load_source(source, path, verbose=verbose, relax=relax, stamp=stamp)
+                    else:
+                        pending.pop()
             # If the target is a filename, load it
             elif os.path.isfile(target):
                 with open(target,'r') as ff:
@@ -2936,76 +3063,8 @@ cause the process to halt with an exception.
         elif hasattr(target,'read') and hasattr(target,'name'):
             # What was the name of the source file?
             sourcefile = os.path.abspath(target.name)
-            # Initialize a local name space; we'll search it for Entries or Collections
-            namespace = {}
-            if verbose:
-                sys.stdout.write('MasterCollection.load: Executing file: ' + sourcefile + '\n')
-            try:
-                exec(target.read(), None, namespace)
-            except:
-                sys.stderr.write('\nMasterCollection.load: Error while executing file: ' + sourcefile + '\n\n')
-                raise sys.exc_info()[1]
-            # Loop over the variables declared while executing the file
-            # Use a state variable to track whether any recognized types were found
-            nfound = True
-            for name, value in namespace.items():
-                # Look for an Entry child instance
-                if issubclass(type(value), Entry):
-                    # Flag that this file does contain valid entries
-                    nfound = False
-                    # If this Entry is already in the MasterCollection raise a warning
-                    # and DO NOT add it.
-                    if value.name in self._entries:
-                        sys.stdout.write(f'MasterCollection.load: Found conflicting definitions for entry: {value.name}\n')
-                        originfile = self._entries[value.name].sourcefile
-                        if originfile:
-                            sys.stdout.write(f'    Originally defined in file: {originfile}\n')
-                        sys.stdout.write(f'    Redundant entry found in file: {sourcefile}\n')
-                        sys.stdout.write(f'    Ignoring the redundant entry!\n')
-                    # OK.  Everything seems good.
-                    else:
-                        # If we're operating verbosely, tell the user what we found
-                        if verbose:
-                            sys.stdout.write('    --> Found entry: ' + value.name + '\n')
-                        # Record the file where the Entry was defined
-                        value.sourcefile = sourcefile
-                        # Run post-processing
-                        value.post(fatal=(not relax))
-                        # Add the entry
-                        self._entries[value.name] = value
-                # Or, look for a Collection
-                elif isinstance(value, Collection):
-                    nfound = False
-                    # Not sure how, but this Collection is already associated with another MasterCollection
-                    # Raise a warning and DO NOT add it.
-                    if not (value.master is None or value.master is self):
-                        sys.stdout.write(f'MasterCollection.load: Collection {value.name} is already associated with another MasterCollection\n')
-                        sys.stdout.write(f'    Defined in file: {sourcefile}\n')
-                    # There is already a Collection with this name in the MasterCollection
-                    # Raise a warning and DO NOT add it.
-                    elif value.name in self._children:
-                        sys.stdout.write(f'MasterCollection.load: Found conflicting definitions for Collection: {value.name}\n')
-                        originfile = self._children[value.name].sourcefile
-                        if originfile:
-                            sys.stdout.write(f'    Originally defined in file: {originfile}\n')
-                        if value.sourcefile:
-                            sys.stdout.write(f'    Redundant Collection found in file: {value.sourcefile}\n')
-                        sys.stdout.write(f'    Ignoring the redundant Collection!\n')
-                    # OK.  Everything seems acceptable.  Add the collection
-                    else:
-                        # If we're operating verbosely, tell the user what we found.
-                        if verbose:
-                            sys.stdout.write('    --> Found collection: ' + value.name + '\n')
-                        # Recurse into sub-collections to mark the sourcefile
-                        # and the master collection
-                        for c in value.collections():
-                            c.sourcefile = sourcefile
-                            c.master = self
-                        # Add the collection to the MasterCollection
-                        self._children[value.name] = value
-            # Warn the user if there were no objects found.
-            if nfound:
-                sys.stderr.write(f'MasterCollection.load: No recognized objects in file: {sourcefile}\n')
+            stamp = _stamp(target)
+            self._load_source(target.read(), sourcefile, verbose=verbose, relax=relax, stamp=stamp)
         else:
             raise TypeError('MasterCollection.load: Requires a string path or a file type.')
         
@@ -3016,21 +3075,28 @@ cause the process to halt with an exception.
         if _top:
             if verbose:
                 sys.stdout.write('MasterCollection.load: Linking entries to their collections.\n')
+            # Index the collection tree by name once rather than searching
+            # it with getchild() for every link.  As with getchild(), the 
+            # first collection found with a name wins.
+            cindex = {}
+            for c in self.collections():
+                cindex.setdefault(c.name, c)
             # Loop through all of the entries in the MasterCollection
             for entry in self:
+                ecollections = entry.collections
                 # If the Entry's collections member is not a list, raise warning and move on.
-                if not isinstance(entry.collections, list):
+                if not isinstance(ecollections, list):
                     sys.stderr.write(f'MasterCollection.load: Illegal collections list for entry: {entry.name}\n')
                     if entry.sourcefile:
                         sys.stderr.write(f'MasterCollection.load: Defined in file: {entry.sourcefile}\n')
                 # If the list is non-empty
-                elif entry.collections:
+                elif ecollections:
                     # Loop through all of the Collections requested by the Entry
-                    for ii,cname in enumerate(entry.collections):
+                    for cname in ecollections:
                         # If the collection appears to be a string collection name
                         if isinstance(cname,str):
                             # Look for the collection in the MasterCollection
-                            c = self.getchild(cname)
+                            c = cindex.get(cname)
                             # If it exists, add the entry and replace the collection name
                             # with a pointer to the actual collection instance.
                             if c is not None:
@@ -3040,6 +3106,7 @@ cause the process to halt with an exception.
                                 sys.stderr.write(f'MasterCollection.load: Unrecognized collection in entry: {entry.name}\n    Creating collection: {cname}\n')
                                 c = Collection(cname)
                                 self.addchild(c)
+                                cindex[cname] = c
                                 c.add(entry)
                             else:
                                 sys.stderr.write(f'MasterCollection.load: Error linking entry to its collection: {entry.name}\n' + \
@@ -3048,6 +3115,88 @@ cause the process to halt with an exception.
                                     sys.stderr.write(f'    Entry defined in file: {entry.sourcefile}\n')
 
         
+    def _load_source(self, source, sourcefile, verbose=False, relax=False, stamp=None):
+        """Execute the source of an eks file and absorb what it defines
+    mc._load_source(source, sourcefile)
+
+This is the work horse of load().  The source code is executed, and the 
+Entries and Collections it defines are added to the MasterCollection.  
+Linking entries to their collections is left to load().  The optional stamp
+identifies the version of the file (see _stamp()) so that its compiled code 
+can be reused.
+"""
+        # Initialize a local name space; we'll search it for Entries or Collections
+        namespace = {}
+        if verbose:
+            sys.stdout.write('MasterCollection.load: Executing file: ' + sourcefile + '\n')
+        try:
+            exec(_compile(source, sourcefile, stamp), None, namespace)
+        except Exception:
+            sys.stderr.write('\nMasterCollection.load: Error while executing file: ' + sourcefile + '\n\n')
+            raise
+        # Loop over the variables declared while executing the file
+        # Use a state variable to track whether any recognized types were found
+        nfound = True
+        for name, value in namespace.items():
+            # Look for an Entry child instance
+            if isinstance(value, Entry):
+                # Flag that this file does contain valid entries
+                nfound = False
+                # If this Entry is already in the MasterCollection raise a warning
+                # and DO NOT add it.
+                if value.name in self._entries:
+                    sys.stdout.write(f'MasterCollection.load: Found conflicting definitions for entry: {value.name}\n')
+                    originfile = self._entries[value.name].sourcefile
+                    if originfile:
+                        sys.stdout.write(f'    Originally defined in file: {originfile}\n')
+                    sys.stdout.write(f'    Redundant entry found in file: {sourcefile}\n')
+                    sys.stdout.write(f'    Ignoring the redundant entry!\n')
+                # OK.  Everything seems good.
+                else:
+                    # If we're operating verbosely, tell the user what we found
+                    if verbose:
+                        sys.stdout.write('    --> Found entry: ' + value.name + '\n')
+                    # Record the file where the Entry was defined
+                    value.sourcefile = sourcefile
+                    # Run post-processing
+                    value.post(fatal=(not relax))
+                    # Add the entry
+                    self._entries[value.name] = value
+            # Or, look for a Collection
+            elif isinstance(value, Collection):
+                nfound = False
+                # Not sure how, but this Collection is already associated with another MasterCollection
+                # Raise a warning and DO NOT add it.
+                if not (value.master is None or value.master is self):
+                    sys.stdout.write(f'MasterCollection.load: Collection {value.name} is already associated with another MasterCollection\n')
+                    sys.stdout.write(f'    Defined in file: {sourcefile}\n')
+                # There is already a Collection with this name in the MasterCollection
+                # Raise a warning and DO NOT add it.
+                elif value.name in self._children:
+                    sys.stdout.write(f'MasterCollection.load: Found conflicting definitions for Collection: {value.name}\n')
+                    originfile = self._children[value.name].sourcefile
+                    if originfile:
+                        sys.stdout.write(f'    Originally defined in file: {originfile}\n')
+                    if value.sourcefile:
+                        sys.stdout.write(f'    Redundant Collection found in file: {value.sourcefile}\n')
+                    sys.stdout.write(f'    Ignoring the redundant Collection!\n')
+                # OK.  Everything seems acceptable.  Add the collection
+                else:
+                    # If we're operating verbosely, tell the user what we found.
+                    if verbose:
+                        sys.stdout.write('    --> Found collection: ' + value.name + '\n')
+                    # Recurse into sub-collections to mark the sourcefile
+                    # and the master collection
+                    for c in value.collections():
+                        c.sourcefile = sourcefile
+                        c.master = self
+                    # Add the collection to the MasterCollection
+                    self._children[value.name] = value
+        # Warn the user if there were no objects found.
+        if nfound:
+            sys.stderr.write(f'MasterCollection.load: No recognized objects in file: {sourcefile}\n')
+
+        
     def addchild(self, cnew):
         """Add a collection to the MasterCollection
     mc.addchild(cnew)
@@ -3072,32 +3221,26 @@ MasterCollection or they may be members of this MasterCollection.
                 if not (cc is None or cc is c):
                     raise Exception(f'MasterCollection.addchild: Collection {c.name} conflicts with another collection.')
             # Scan for contradictions in the entries
-            # Keep track of any new entries so we can add them once we know
-            # that the addition is safe.
-            newentries = []
+            # Gather the new entries by name in a single pass so we can add
+            # them once we know that the addition is safe.  The same entry
+            # may legitimately appear in more than one of the collections.
+            newentries = {}
             for newentry in cnew:
-                # Does the entry already belong to this MasterCollection?
-                oldentry = self._entries.get(newentry.name)
-                # If so, make sure it's the same entry
-                if oldentry is None:
-                    newentries.append(newentry)
-                elif oldentry is not newentry:
+                oldentry = newentries.setdefault(newentry.name, newentry)
+                if oldentry is not newentry:
                     raise Exception(f'MasterCollection.addchild: There are contradictory entries for: {newentry.name}')
+            # Only the names that already belong to this MasterCollection 
+            # need to be checked, and they must be the same entries.
+            for name in newentries.keys() & self._entries.keys():
+                if self._entries[name] is not newentries[name]:
+                    raise Exception(f'MasterCollection.addchild: There are contradictory entries for: {name}')
                     
             # OK, this addition is safe
             # First, set the master collections
             for c in cnew.collections():
                 c.master = self
             # Read in all the entries in case there are any new ones.
-            for newentry in cnew:
-                # Does the entry already belong to this MasterCollection?
-                oldentry = self._entries.get(newentry.name)
-                # If so, make sure it's the same entry
-                if oldentry is not None and oldentry is not newentry:
-                    raise Exception(f'MasterCollection.addchild: There are contradictory entries for: {newentry.name}')
-                # If the entry does not exist, add it.
-                else:
-                    self._entries[newentry.name] = newentry
+            self._entries.update(newentries)
             self._children[cnew.name] = cnew
             # This probably invalidates all previous sorted data for Master only
             self._sorted = {}
@@ -3145,22 +3288,33 @@ collections Include the collection tree in the saved data (def True)
 collectionfile  Name of the file to use for collections in directory mode
             (def 000.eks)
 """
+        if isinstance(target, os.PathLike):
+            target = os.fspath(target)
         ##################
         # DIRECTORY MODE #
         ##################
         if isinstance(target,str) and os.path.isdir(target):
             target = os.path.abspath(target)
+            # All of the files live directly in target, so there's no need
+            # to call os.path.join() for every one of them.
+            prefix = os.path.join(target, '')
             
-            # First, purge all existing eks files
-            if overwrite:
-                if verbose:
-                    sys.stdout.write('MasterCollection.save: Removing files...\n')
-                for filename in os.listdir(target):
-                    if filename.endswith(EXT):
-                        fullfilename = os.path.join(target,filename)
+            # Record the names that are already taken in the directory, so 
+            # finding a free file name below is a set lookup per attempt 
+            # instead of an os.path.exists() stat.  They are folded to lower
+            # case so the test is also safe on case-insensitive file systems.
+            taken = set()
+            if overwrite and verbose:
+                sys.stdout.write('MasterCollection.save: Removing files...\n')
+            with os.scandir(target) as contents:
+                for this in contents:
+                    # First, purge all existing eks files
+                    if overwrite and this.name.endswith(EXT):
                         if verbose:
-                            sys.stdout.write('    ' + fullfilename + '\n')
-                        os.remove(fullfilename)
+                            sys.stdout.write('    ' + this.path + '\n')
+                        os.remove(this.path)
+                    else:
+                        taken.add(this.name.lower())
             
             if verbose:
                 sys.stdout.write('MasterCollection.save: Preparing entries...\n')
@@ -3176,13 +3330,15 @@ collectionfile  Name of the file to use for collections in directory mode
             filename = collectionfile[:-4]
 
             # Make sure the name hasn't already been created
-            fullfilename = os.path.join(target,collectionfile)
+            name = collectionfile
             for count in range(1,101): 
-                if not os.path.exists(fullfilename):
+                if name.lower() not in taken:
                     break
-                fullfilename = os.path.join(target,  filename + '_' + str(count) + EXT)
-            if count == 100:
-                raise Exception('MasterCollection.save: Failed to find a unique file name in 100 attempts with entry: {}'.format(entry.name))
+                name = filename + '_' + str(count) + EXT
+            else:
+                raise Exception(f'MasterCollection.save: Failed to find a unique file name in 100 attempts for the collection file: {collectionfile}')
+            taken.add(name.lower())
+            fullfilename = prefix + name
             
             # Save the collections
             if verbose:
@@ -3193,9 +3349,9 @@ collectionfile  Name of the file to use for collections in directory mode
                 for ii,c in enumerate(self.collections()):
                     # Disallow re-calling a master collection save algorithm
                     if not isinstance(c, MasterCollection):
-                        v = 'c{:03d}'.format(ii)
+                        v = f'c{ii:03d}'
                         crecord[c.name] = v
-                        c.save(ff, addimport=first, varname = v)
+                        c.write(ff, addimport=first, varname = v)
                         first = False
                     
                 # Link the collections and update the entries' collections lists
@@ -3214,18 +3370,19 @@ collectionfile  Name of the file to use for collections in directory mode
             for entry in self:
                 # Build a file name from the entry name
                 # Strip out all but alpha numeric and _ - characters
-                filename = ''
-                for char in entry.name:
-                    if char.isalnum() or char in '_-':
-                        filename += char
+                filename = entry.name.translate(_FILENAME_DROP)
+                if not filename.isascii():
+                    filename = _FILENAME_STRIP.sub('', filename)
                 # Make sure the name hasn't already been created
-                fullfilename = os.path.join(target,filename + EXT)
+                name = filename + EXT
                 for count in range(1,101): 
-                    if not os.path.exists(fullfilename):
+                    if name.lower() not in taken:
                         break
-                    fullfilename = os.path.join(target, filename + '_' + str(count) + EXT)
-                if count == 100:
-                    raise Exception('MasterCollection.save: Failed to find a unique file name in 100 attempts with entry: {}'.format(entry.name))
+                    name = filename + '_' + str(count) + EXT
+                else:
+                    raise Exception(f'MasterCollection.save: Failed to find a unique file name in 100 attempts with entry: {entry.name}')
+                taken.add(name.lower())
+                fullfilename = prefix + name
                 # Save the entry
                 if verbose:
                     sys.stdout.write(entry.name + ' --> ' + fullfilename + '\n')
@@ -3252,14 +3409,14 @@ collectionfile  Name of the file to use for collections in directory mode
         elif hasattr(target,'write'):
             first = True
             for ii,entry in enumerate(self):
-                entry.write(target, addimport=first, varname='e{:03d}'.format(ii))
+                entry.write(target, addimport=first, varname=f'e{ii:03d}')
                 first = False
             
             # Write the collections
             # Keep a record of all the variable names used
             crecord = {}
             for ii,c in enumerate(self.collections(rself=False)):
-                v = 'c{:03d}'.format(ii)
+                v = f'c{ii:03d}'
                 crecord[c.name] = v
                 c.write(target=target,varname=v,addimport=False)
              
@@ -3308,38 +3465,152 @@ raising an exception.  A warning will still be printed.
 
 
 
-def loadbib(target, verbose=False):
-    """LOADBIB
-    c = loadbib('/path/to/file.bib')
+# Character classes used by _bibscan().  The scanner works on the raw bytes of
+# the file, so these are tables indexed by the integer character code, true
+# for the members of the class.  Indexing a tuple with a small int is 
+# specialized by the interpreter and beats even a frozenset hash probe.  
+# BibTeX syntax is pure ASCII; multi-byte UTF-8 characters can only appear in
+# names and item data, and every one of their bytes is above 0x7F.
+_BIB_SPACE = tuple(code in b' \t\n\r\v\f' for code in range(256))
+_BIB_ALPHA = tuple(code in b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz' 
+        for code in range(256))
+# Characters that are never allowed in entry names
+_BIB_SPECIAL = tuple(code in b'"{},@#=' for code in range(256))
+# Patterns used by the item data sub-scanners.  They let the re module find 
+# the next character of interest in C instead of stepping through every byte
+# of the item in the interpreter.  The bytes \s class is the same as 
+# _BIB_SPACE.
+_BIB_NEWLINE = re.compile(rb'\n')
+_BIB_LETTERS = re.compile(rb'[A-Za-z]*')
+_BIB_NAME = re.compile(rb'[^\s"{},@#=]*')
+_BIB_BRACE = re.compile(rb'[{}]')
+_BIB_QUOTE = re.compile(rb'[{}"]')
+_BIB_WORD = re.compile(rb'[^\s,{}"#]*')
+# An item name and the = after it, with the whitespace around the =
+_BIB_ITEMHEAD = re.compile(rb'([A-Za-z]+)\s*=\s*')
+
+def _bibbraced(data, start):
+    """Helper function that finds the end of braced item data for _bibscan()
+    end = _bibbraced(data, start)
     
-Returns a collection containing entries loaded from the bib file.  This bibtex
-parser respects the rules described on the BibTeX site:
-    http://www.bibtex.org/Format/
-    
-The loadbib funciton accepts a single optional keyword argument, verbose.  When 
-True, the funciton prints its findings to stdout.
+start is the offset just after the opening {, and end is the offset of the 
+matching }.  Nested brackets are counted, and quotes are ordinary characters.
+Returns -1 if the brackets are never closed.
 """
+    depth = 0
+    search = _BIB_BRACE.search
+    found = search(data, start)
+    while found:
+        end = found.start()
+        if data[end] == b'{'[0]:
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            return end
+        found = search(data, end+1)
+    return -1
 
-    if isinstance(target,str):
-        if verbose:
-            sys.stdout.write('load: opening file: ' + target + '\n')
-        with open(target,'r') as ff:
-            return loadbib(ff, verbose=verbose)
-
-    output = MasterCollection()
-    output.doc = 'Created by eikosi.loadbib()'
+def _bibquoted(data, start):
+    """Helper function that finds the end of quoted item data for _bibscan()
+    end = _bibquoted(data, start)
+    
+start is the offset just after the opening ", and end is the offset of the 
+closing ".  A quote inside of brackets does not close the data, so that {"} 
+may be used to write a literal quote.  Returns -1 if the quote is never 
+closed.
+"""
+    depth = 0
+    search = _BIB_QUOTE.search
+    found = search(data, start)
+    while found:
+        end = found.start()
+        char = data[end]
+        if char == b'{'[0]:
+            depth += 1
+        elif char == b'}'[0]:
+            # A stray } is kept as an ordinary character
+            if depth:
+                depth -= 1
+        elif not depth:
+            return end
+        found = search(data, end+1)
+    return -1
+
+def _bibword(data, start):
+    """Helper function that finds the end of a bare word for _bibscan()
+    end = _bibword(data, start)
+    
+A bare word is a number or the name of a @STRING, and it ends at whitespace 
+or at any of the characters ,{}"#.  end is the offset of the character that 
+ended the word, or the length of data.
+"""
+    return _BIB_WORD.match(data, start).end()
 
-    # Recognized types
-    entrytypes = {
-        '@ARTICLE': ArticleEntry,
-        '@INPROCEEDINGS': ConferenceEntry,
-        '@TECHREPORT': ReportEntry,
-        '@BOOK': BookEntry,
-        '@MISC': MiscEntry,
-    }
+def _bibdecode(raw):
+    """Helper function that decodes the raw bytes of a BibTeX name or item
+    text = _bibdecode(raw)
+    
+BibTeX files are normally UTF-8, but older files are often Latin-1.  Bytes 
+that are not valid UTF-8 are decoded as Latin-1 rather than raising an error
+or being replaced, so accented names survive either way.
+"""
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+
+#   _bibscan() is the hot loop of loadbib(), but it is deliberately left to 
+#   the interpreter rather than JIT-compiled with Numba.  Its output is made up
+#   of str and dict objects, and Numba would force a copy of the input into a
+#   numpy array and a decode of every value back into Python objects, along
+#   with a heavy binary dependency.  It is sped up with C-level str/bytes and
+#   re operations instead.
+def _bibpos(data, offset, mark):
+    """Helper function that finds the line and column of an offset in data
+    line, col = _bibpos(data, offset, mark)
+    
+Lines and columns are counted from 1, and columns are counted in bytes.  mark
+is a list, [offset, line, linestart], that remembers the last position found
+so that only the newlines since then need to be counted.  It should start as 
+[0, 1, 0], and offsets must not decrease from one call to the next.
+"""
+    start, line, linestart = mark
+    head = bytes(data[start:offset])
+    newlines = head.count(b'\n')
+    if newlines:
+        line += newlines
+        linestart = start + head.rfind(b'\n') + 1
+    mark[:] = offset, line, linestart
+    return line, offset - linestart + 1
+
+def _bibat(data, offset, mark):
+    """Helper function that builds the position prefix of a _bibscan() message
+    raise Exception(f'{_bibat(data, offset, mark)}text of the message')
+    
+Returns 'loadbib: On line LINE col COL, ', using _bibpos() to find the line
+and column.  It is only called once there is something to report.
+"""
+    line, col = _bibpos(data, offset, mark)
+    return f'loadbib: On line {line} col {col}, '
 
-    # Special characters 
-    special = '"{},@#='
+def _bibscan(data):
+    """Helper function that does the work of reading BibTeX data for loadbib()
+    for entrytype, entryname, bib in _bibscan(data):
+        ...
+    
+_bibscan() is a generator that steps through the BibTeX bytes in data and 
+yields a tuple for each entry it finds.  The entry type is an upper-case 
+string with its leading @ (e.g. '@ARTICLE'), the entry name is a string, and 
+bib is a dict of item strings keyed by item name.  @STRING definitions are 
+substituted into the items that use them, and @STRING and @COMMENT entries 
+are never yielded.  The scanner knows nothing about Entry classes, so it is
+up to the caller to recognize the entry types.
+
+The data are only decoded into str at the end of each item, so data must be
+a bytes-like object with newlines already normalized to '\n'.
+"""
 
     # create some state variables
     # The reading state indicates how the stream of characters should be 
@@ -3349,7 +3620,7 @@ True, the funciton prints its findings to stdout.
     #       non-whitespace character.
     #       Exit gracefully on EOF
     # state=1       Read in the entry type
-    #       Read in alpha characters
+    #       The alpha characters are read in one step on the @ in state 0
     #       On { increment two states (skip state 2)
     #       On whitespace, increment the state
     #       Raise an error on non-alpha characters or EOF
@@ -3376,12 +3647,13 @@ True, the funciton prints its findings to stdout.
     # state=7       Consume whitespace searching for =
     #
     # state=8       Consume whitespace searching for item data
-    #
-    # state=9       Read item data
+    #       On { or " jump past the matching } or " and go to state 10.
+    #       On anything else read a bare word and go to state 10.
     #       Strip off outer {} or ""
-    #       Raise an error on unescaped special characters
-    #       Increment the state on unescaped whitespace or closing {} ""
-    #       Return to state 0 if } reduces to 0 bracket count
+    #       Look up bare words in the @STRING definitions
+    #       Raise an error on special characters or a value that never ends
+    # state=9       Unused.  Item data are read by the sub-scanners in state 8.
+    #
     # state=10      Post item data
     #       Consume whitespace
     #       Return to state=8 on # (string concatenation)
@@ -3389,308 +3661,449 @@ True, the funciton prints its findings to stdout.
     #       Return to state=0 on }
     #       Raise an error on any other non-whitespace character
     # state=11      Comments
-    #       Consume all text while counting brackets pop back to state 0 when
-    #       brackets are closed.
+    #       Jump past the bracket that closes the comment and pop back to 
+    #       state 0.
     
     state = 0       # The state index
-    activetype = ''
-    activename = ''
-    activeitem = ''
-    activedata = ''
-    word = ''
-    endofentry = False  # Flag that the data are ready to be processed
-    endofitem = False   # Flag that an item is ready to be processed
-    endofword = False   # Flag that a word is ready to be processed
-    comment = False
+    activetype = bytearray()
+    activename = bytearray()
+    activeitem = bytearray()
+    # The item data are accumulated in a bytearray and only decoded at the
+    # end of the item.  Repeated += on a str copies the whole value every 
+    # time.
+    activedata = bytearray()
+    # What the current byte finished, as the sum of the flags: 1 for an 
+    # item, 2 for an entry.  It is a single int so that the bytes that 
+    # finish nothing, which are nearly all of them, pass with one test.
+    finished = 0
     string = {}
+    shared = {}     # Decoded item names and values by their raw bytes
     bib = {}
     bracket = 0     # Bracket pair depth
-    quote = False   # Quote pair active?
-    line = 1
-    col = 1
 
-    data = target.read()
-    for char in data:
+    # This loop runs once for every byte of the entry syntax, so bind the 
+    # names it uses to locals ahead of time.  Indexing bytes produces 
+    # integer character codes, so they are compared against constants like 
+    # b'@'[0], which the compiler folds to a plain integer, and they index
+    # the character class tables directly.  Item data are skipped over in 
+    # one step by the sub-scanners.
+    space = _BIB_SPACE
+    special = _BIB_SPECIAL
+    alpha = _BIB_ALPHA
+    string_get = string.get
+    newline = _BIB_NEWLINE.search
+    letters = _BIB_LETTERS.match
+    namechars = _BIB_NAME.match
+    itemhead = _BIB_ITEMHEAD.match
+    stderr = sys.stderr.write
+    # The line and column are only worked out from the offset when there is
+    # something to report, so that they cost nothing on every other byte.
+    mark = [0, 1, 0]
+    offset = 0
+    size = len(data)
+    while offset < size:
+        char = data[offset]
         
         ## Really handy for debugging...
         # print(state, char)
         
-        # Detect the beginning of a comment
-        if not quote and not bracket and char=='%':
-            comment = True
+        # Detect the beginning of a comment and jump past the end of the line
+        if not bracket and char==b'%'[0]:
+            found = newline(data, offset)
+            if found is None:
+                break
+            offset = found.end()
+            continue
         # Case out the state conditions
-        # If we're in a comment, bypass all state handling
-        if comment:
-            if char == '\n':
-                comment = False
+        # The chain is tested from the top, so the states that see the most
+        # bytes (the whitespace between items and around their values) go 
+        # first.  The rest follow in the order an entry passes through them.
+        # STATE 5: Burn whitespace looking for an item name
+        if state == 5:
+            if space[char]:
+                pass
+            elif char == b'}'[0]:
+                bracket = 0
+                finished = 2
+            elif alpha[char]:
+                # Almost every item is a name, =, and optional whitespace,
+                # so take that whole run as one token and go straight to the
+                # item data.  Anything else is left to states 6 and 7.
+                found = itemhead(data, offset)
+                if found is not None:
+                    activeitem = bytearray(data[offset:found.end(1)])
+                    activedata = bytearray()
+                    offset = found.end() - 1
+                    state = 8
+                else:
+                    end = letters(data, offset).end()
+                    activeitem = bytearray(data[offset:end])
+                    offset = end - 1
+                    state += 1
+            elif special[char]:
+                raise Exception(f'{_bibat(data, offset, mark)}unexpected character, {chr(char)}, while parsing entry: {_bibdecode(activename)}\n')
+        # Read trailing whitespace unitl , or #
+        elif state == 10:
+            if char == b','[0]:
+                finished = 1
+            elif char == b'}'[0]:
+                bracket = 0
+                finished = 3
+            elif char == b'#'[0]:
+                state = 8
+            elif space[char]:
+                pass
+            else:
+                raise Exception(f'{_bibat(data, offset, mark)}unexpected character parsing entry {_bibdecode(activename)}, item {_bibdecode(activeitem)}. Missing quote, bracket or comma?')
+        # STATE 8: Burn whitespace looking for item data
+        # The item data are read in a single step by the sub-scanners, which 
+        # leave the offset on the last character of the data.
+        elif state == 8:
+            # Do not record leading { or "
+            if char == b'{'[0]:
+                end = _bibbraced(data, offset+1)
+                if end < 0:
+                    state = 9
+                    break
+                activedata.extend(data[offset+1:end])
+                offset = end
+                state = 10
+            elif char == b'"'[0]:
+                end = _bibquoted(data, offset+1)
+                if end < 0:
+                    state = 9
+                    break
+                activedata.extend(data[offset+1:end])
+                offset = end
+                state = 10
+            elif char == b','[0]:
+                activedata = bytearray()
+                finished = 1
+            elif space[char]:
+                pass
+            elif special[char]:
+                raise Exception(f'{_bibat(data, offset, mark)}unexpected special character: {chr(char)}.')
+            else:
+                end = _bibword(data, offset)
+                if end < size and data[end] == b'"'[0]:
+                    raise Exception(f'{_bibat(data, end, mark)}illegal start of quote in the middle of item data.')
+                # Is this word a string variable?
+                word = bytes(data[offset:end])
+                value = string_get(word)
+                if value is not None:
+                    activedata.extend(value)
+                else:
+                    activedata.extend(word)
+                # Leave the character that ended the word for state 10
+                offset = end - 1
+                state = 10
+                
         # STATE 0: Burn whitespace looking for an entry
         elif state == 0:
-            if bib or activename or activetype or activeitem:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected ineternal error. Failed to re-initialize the state memory after the last entry.'.format(line, col))
-            if char.isspace():
+            if space[char]:
+                pass
+            elif char == b'@'[0]:
+                # Read the whole type at once and leave the character after
+                # it for state 1
+                end = letters(data, offset+1).end()
+                activetype = bytearray(data[offset:end])
+                offset = end - 1
+                state += 1
+            else:
+                raise Exception(f'{_bibat(data, offset, mark)}expected @ starting a new entry.')
+        # STATE 3: Burn whitespace looking for the entry name
+        elif state == 3:
+            if space[char]:
                 pass
-            elif char == '@':
-                activetype = char
+            elif special[char]:
+                raise Exception(f'{_bibat(data, offset, mark)}unexpected character in entry name: {chr(char)}\n')
+            else:
+                end = namechars(data, offset).end()
+                activename = bytearray(data[offset:end])
+                offset = end - 1
+                state += 1
+        # STATE 4: Read in the entry name
+        elif state == 4:
+            if char == b'}'[0]:
+                bracket = 0                    
+                finished = 2
+            elif char == b','[0]:
                 state += 1
+            elif space[char]:
+                stderr(f'{_bibat(data, offset, mark)}ignoring unexpected whitespace in entry name.\n')
+            elif special[char]:
+                raise Exception(f'{_bibat(data, offset, mark)}illegal special character in the entry name.\n')
             else:
-                raise Exception('loadbib: On line {:d} col {:d}, expected @ starting a new entry.'.format(line, col))
+                activename.append(char)
+            
         # STATE 1: New entry... Read in the entry type
         elif state == 1:
-            if char.isalpha():
-                activetype += char.upper()
-            elif char.isspace():
+            if space[char]:
+                activetype = activetype.upper()
                 state += 1
-            elif char == '{':
-                if activetype == '@STRING':
+            elif char == b'{'[0]:
+                activetype = activetype.upper()
+                if activetype == b'@STRING':
                     # Skip looking for the entry name
                     state = 5
-                elif activetype == '@COMMENT':
+                elif activetype == b'@COMMENT':
                     # Special rules for reading in comments
                     state = 11
                 else:
                     state += 2
                 bracket = 1
             else:
-                raise Exception('loadbib: On line {:d} unexpected character while reading the entry type: {}'.format(line, col, char))
+                raise Exception(f'{_bibat(data, offset, mark)}unexpected character while reading the entry type: {chr(char)}')
         # STATE 2: Burn whitespace while looking for the { opening the entry
         elif state == 2:
-            if char.isspace():
+            if space[char]:
                 pass
-            elif char == '{':
-                if activetype == '@STRING':
+            elif char == b'{'[0]:
+                if activetype == b'@STRING':
                     # Skip looking for the entry name
                     state = 5
-                elif activetype == '@COMMENT':
+                elif activetype == b'@COMMENT':
                     # Special rules for reading in comments
                     state = 11
                 else:
                     state += 1
                 bracket=1
             else:
-                raise Exception('loadbib: On line {:d} expected \{ to start the entry but found character: {}'.format(line, col,char))
-        # STATE 3: Burn whitespace looking for the entry name
-        elif state == 3:
-            if activename:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected internal error.  Failed to initialize the activename state.'.format(line, col))
-            if char.isspace():
-                pass
-            elif char in special:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected character in entry name: {}\n'.format(line, col,char))
-            else:
-                activename = char
-                state += 1
-        # STATE 4: Read in the entry name
-        elif state == 4:
-            if char == '}':
-                bracket = 0                    
-                endofentry = True
-            elif char == ',':
-                state += 1
-            elif char.isspace():
-                sys.stderr.write('loadbib: On line {:d} col {:d}, ignoring unexpected whitespace in entry name.\n'.format(line, col))
-            elif char in special:
-                raise Exception('loadbib: On line {:d} col {:d}, illegal special character in the entry name.\n'.format(line, col))
-            else:
-                activename += char
-            
-        # STATE 5: Burn whitespace looking for an item name
-        elif state == 5:
-            if activeitem:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected internal error.  Failed to initialize the activeitem state.'.format(line, col))
-            if char.isspace():
-                pass
-            elif char == '}':
-                bracket = 0
-                endofentry = True
-            elif char.isalpha():
-                state += 1
-                activeitem = char
-            elif char in special:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected character, {}, while parsing entry: {}\n'.format(line, col,char, activename))
+                raise Exception(f'{_bibat(data, offset, mark)}expected {{ to start the entry but found character: {chr(char)}')
         # STATE 6: Read in the item name
         elif state == 6:
-            if quote or bracket != 1:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected internal error; failure to close quotes or brackets.'.format(line, col))
-            if char == '=':
-                activedata = ''
-                word = ''
+            if char == b'='[0]:
+                activedata = bytearray()
                 state += 2
-            elif char.isalpha():
-                activeitem += char
-            elif char.isspace():
+            elif alpha[char]:
+                activeitem.append(char)
+            elif space[char]:
                 state += 1
             else:
-                raise Exception('loadbib: On line {:d} col {:d}, illegal character in item name.\n'.format(line, col))
+                raise Exception(f'{_bibat(data, offset, mark)}illegal character in item name.\n')
         # STATE 7: Burn whitespace looking for =
         elif state == 7:
-            if char == '=':
-                activedata = ''
-                word = ''
-                state += 1
-            elif char.isspace():
-                pass
-            else:
-                raise Exception('loadbib: On line {:d} col {:d}, expected =, but found: {}.\n'.format(line, col, char))
-        # STATE 8: Burn whitespace looking for item data
-        elif state == 8:
-            if bracket != 1:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected error. Bracket count is not 1!\n'.format(line, col))
-            # Do not record leading { or "
-            if char == '{':
-                bracket += 1
-                state += 1
-            elif char == '"':
-                quote = True
+            if char == b'='[0]:
+                activedata = bytearray()
                 state += 1
-            elif char == ',':
-                activedata = ''
-                endofitem = True
-            elif char.isspace():
+            elif space[char]:
                 pass
-            elif char in special:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected special character: {}.'.format(line,col,char))
             else:
-                word = char
-                state += 1
-        # Read in item data
-        elif state == 9:
-            if char == '{':
-                bracket += 1
-                word += char
-            elif char == '}':
-                # Treat brackets inside of quotes as regular characters
-                if quote:
-                    word += char
+                raise Exception(f'{_bibat(data, offset, mark)}expected =, but found: {chr(char)}.\n')
+        # Reading in a comment.  Jump to the bracket that closes it.
+        elif state == 11:
+            end = _bibbraced(data, offset)
+            if end < 0:
+                break
+            offset = end
+            bracket = 0
+            finished = 2
+        
+        if finished:
+            if finished & 1:
+                if activetype == b'@STRING':
+                    # String values are kept raw so they can be spliced into 
+                    # the item data that refer to them.
+                    string[bytes(activeitem)] = bytes(activedata)
                 else:
-                    bracket -= 1
-                    if bracket == 1:
-                        state += 1 # Do not record trailing brackets.
-                        activedata += word
+                    # Item names and short values repeat from entry to entry 
+                    # (the same journal, publisher, or year), so each distinct 
+                    # one is decoded once and then shared.  Long values, like 
+                    # titles and abstracts, are almost never repeated.
+                    raw = bytes(activeitem)
+                    item = shared.get(raw)
+                    if item is None:
+                        item = shared[raw] = sys.intern(raw.decode('ascii'))
+                    if item in bib:
+                        stderr(f'loadbib: Redundant entry for item {item} in entry {_bibdecode(activename)}.  Overwriting.\n')
+                    if len(activedata) > 64:
+                        value = _bibdecode(activedata)
                     else:
-                        word += char
-            elif char == '"':
-                # Inside of brackets, regard quotes like any other character
-                if bracket > 1:
-                    word += char
-                # Do not record trailing quotes
-                elif quote:
-                    quote = False
-                    state += 1
-                    activedata += word
-                else:
-                    raise Exception('loadbib: On line {:d} col {:d}, illegal start of quote in the middle of item data.'.format(line, col))
-            elif char == ',':
-                if quote or bracket>1:
-                    word += char
-                elif word in string:
-                    activedata += string[word]
-                    endofitem = True
-                else:
-                    activedata += word
-                    endofitem = True
-            elif char.isspace():
-                # A space in quotes or brackets is just another character
-                if quote or bracket>1:
-                    word += char
-                # Otherwise, it's the end of a word; look it up?
-                elif word in string:
-                    activedata += string[word]
-                    state += 1
-                # Ok, this is just the end of a word.
-                else:
-                    activedata += word
-                    state += 1
-            else:
-                word += char
-                
-        # Read trailing whitespace unitl , or #
-        elif state == 10:
-            if quote or bracket != 1:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected internal error; failure to close quotes or brackets.'.format(line, col))
-            if char == ',':
-                endofitem = True
-            elif char == '}':
-                bracket = 0
-                endofitem = True
-                endofentry = True
-            elif char == '#':
-                word = ''
-                state = 8
-            elif char.isspace():
-                pass
-            else:
-                raise Exception('loadbib: On line {:d} col {:d}, unexpected character parsing entry {}, item {}. Missing quote, bracket or comma?'.format(line, col, activename, activeitem))
-        # Reading in a comment.  Keep reading until bracket == 0
-        elif state == 11:
-            if char == '{':
-                bracket += 1
-            elif char == '}':
-                bracket -= 1
-                if bracket == 0:
-                    endofentry = True
-        
-        if endofitem:
-            if activeitem in bib:
-                sys.stderr.write('loadbib: Redundant entry for item {} in entry {}.  Overwriting.\n'.format(activeitem, activename))
-            if quote or bracket > 1:
-                raise Exception('loadbib: Unexpected error in entry {}. Unclosed quote or bracket?\n'.format(activename))
-            elif activetype == '@STRING':
-                string[activeitem] = activedata
-            elif activetype not in entrytypes:
-                raise Exception('loadbib: Unrecognized entry type {} in entry {}.'.format(activetype, activename))
-            else:
-                et = entrytypes[activetype]
-                allowed,inputhandler,codehandler,outputhandler = et.get_rules(et,activeitem)
-                if not isinstance(activedata,allowed):
-                    raise Exception('loadbib: On line {:d}, illegal data type for item {} in entry type {}.'.format(line,activeitem,activetype))
-                bib[activeitem] = activedata
+                        raw = bytes(activedata)
+                        value = shared.get(raw)
+                        if value is None:
+                            value = shared[raw] = _bibdecode(raw)
+                    bib[item] = value
                 
-            # Reset the item state
-            activeitem = ''
-            activedata = ''
-            word = ''
-            endofitem = False
-            state = 5
-            
-        # If the entry is complete
-        # Process all of the items one-by-one
-        if endofentry:
-            if activetype == '@STRING':
-                pass
-            elif activetype == '@COMMENT':
-                pass
-            # If this is a recognized entry type
-            elif activetype in entrytypes:
-                # Create the entry instance
-                newentry = entrytypes[activetype](activename)
-                newentry.bib = bib
-                newentry.post()
-                output.add(newentry)
-            else:
-                raise Exception('loadbib: Unrecognized entry type: {}.'.format(activetype))
-            # Reset the entry state
-            state = 0
-            bracket = 0
-            quote = 0
-            bib = {}
-            activename = ''
-            activetype = ''
-            activeitem = ''
-            activedata = ''
-            word = ''
-            endofentry = False
-            endofitem = False
+                # Reset the item state
+                activeitem = bytearray()
+                activedata = bytearray()
+                state = 5
             
-        # Keep track of the line and column number
-        col += 1
-        if char == '\n':
-            line += 1
-            col = 1
+            # If the entry is complete
+            # Process all of the items one-by-one
+            if finished & 2:
+                if activetype == b'@STRING':
+                    pass
+                elif activetype == b'@COMMENT':
+                    pass
+                # Hand everything else to the caller
+                else:
+                    yield activetype.decode('ascii'), _bibdecode(activename), bib
+                # Reset the entry state
+                state = 0
+                bracket = 0
+                bib = {}
+                activename = bytearray()
+                activetype = bytearray()
+                activeitem = bytearray()
+                activedata = bytearray()
+            finished = 0
+
+        offset += 1
     
     if bracket != 0 or state!=0:
-        sys.stderr.write('loadbib: Reached end-of-file while still parsing:\n')
-        sys.stderr.write('         type: {}\n  entry name: {}\n        item: {}\n\n'.format(activetype, activename, activeitem))
-        sys.stderr.write('         Check for an unclosed bracket or quote?\n\n')
+        stderr('loadbib: Reached end-of-file while still parsing:\n')
+        stderr(f'         type: {_bibdecode(activetype)}\n  entry name: {_bibdecode(activename)}\n        item: {_bibdecode(activeitem)}\n\n')
+        stderr('         Check for an unclosed bracket or quote?\n\n')
         raise Exception('loadbib: Unexpected end-of-file.\n')
+
+
+# Entry classes for the BibTeX entry types recognized by loadbib()
+_BIBTYPES = {
+    '@ARTICLE': ArticleEntry,
+    '@INPROCEEDINGS': ConferenceEntry,
+    '@TECHREPORT': ReportEntry,
+    '@BOOK': BookEntry,
+    '@MISC': MiscEntry,
+}
+
+def loadbib(target, verbose=False, cachedir=None):
+    """LOADBIB
+    c = loadbib('/path/to/file.bib')
+        OR
+    c = loadbib('/path/to/file.bib', cachedir='/path/to/cache')
+        OR
+    c = loadbib(file_object)
+    
+Returns a collection containing entries loaded from the bib file.  This bibtex
+parser respects the rules described on the BibTeX site:
+    http://www.bibtex.org/Format/
+
+The target may also be an open file object in text or binary mode, including
+the readers from the gzip, bz2, and lzma modules:
+    with gzip.open('/path/to/file.bib.gz', 'rb') as ff:
+        c = loadbib(ff)
+Plain binary files are memory mapped; everything else is read with read().
+    
+The loadbib funciton accepts two optional keyword arguments.
+
+verbose (False)
+When True, the funciton prints its findings to stdout.
+
+cachedir (None)
+When a bib file is loaded by its path and cachedir is a directory, the parsed
+collection is pickled there, and later calls return the pickled copy until 
+the file's path, modification time, or size change, or until eikosi itself is
+updated.  A natural choice is
+    os.path.expanduser('~/.cache/eikosi')
+The cache is ignored when the EIKOSI_NOCACHE environment variable is set to a
+non-empty value.  Cache files are unpickled, so cachedir must not be writable
+by anyone who is not trusted.
+"""
+
+    if isinstance(target, os.PathLike):
+        target = os.fspath(target)
+    if isinstance(target,str):
+        if verbose:
+            sys.stdout.write('load: opening file: ' + target + '\n')
+        with open(target,'rb') as ff:
+            stat = os.fstat(ff.fileno())
+            cachefile = None
+            if cachedir is not None and not os.environ.get('EIKOSI_NOCACHE'):
+                # The version and pickle protocol are part of the key so that
+                # a cache written by another release of eikosi (or another 
+                # Python) is never picked up.
+                key = f'{os.path.abspath(target)}|{stat.st_mtime_ns}|{stat.st_size}|{__version__}|{pickle.HIGHEST_PROTOCOL}'
+                cachefile = os.path.join(cachedir, 
+                        hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '.pkl')
+                try:
+                    with open(cachefile, 'rb') as cf:
+                        output = pickle.load(cf)
+                    if verbose:
+                        sys.stdout.write('load: using cached file: ' + cachefile + '\n')
+                    return output
+                except FileNotFoundError:
+                    pass
+                except Exception:
+                    sys.stderr.write(f'loadbib: Ignoring unreadable cache file: {cachefile}\n')
+            # Map the file instead of copying it into memory.  Empty files 
+            # cannot be mapped.
+            if not stat.st_size:
+                output = _loadbib(b'')
+            else:
+                with mmap.mmap(ff.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    output = _loadbib(mm)
+        # Failing to write the cache is not fatal.  Write to a temporary file
+        # first so a partial pickle can never be picked up later.
+        if cachefile is not None:
+            try:
+                os.makedirs(cachedir, exist_ok=True)
+                with open(cachefile + '.tmp', 'wb') as cf:
+                    pickle.dump(output, cf, pickle.HIGHEST_PROTOCOL)
+                os.replace(cachefile + '.tmp', cachefile)
+            except Exception:
+                sys.stderr.write(f'loadbib: Failed to write cache file: {cachefile}\n')
+        return output
+
+    # A plain binary file at its start is mapped just like a path instead of
+    # being read into memory in one piece.  Only a FileIO, bare or buffered,
+    # is known to read the raw bytes behind its descriptor.  Wrappers like 
+    # GzipFile also have a fileno(), but it is the compressed file's, so 
+    # everything else is read through read().
+    if isinstance(target, (io.FileIO, io.BufferedReader)) and \
+            isinstance(getattr(target, 'raw', target), io.FileIO):
+        try:
+            fileno = target.fileno()
+            size = os.fstat(fileno).st_size
+            start = target.tell()
+        except (AttributeError, OSError, ValueError):
+            start = None
+        if start == 0 and size:
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mm:
+                output = _loadbib(mm)
+            # Leave the file where read() would have left it
+            target.seek(0, os.SEEK_END)
+            return output
+
+    # The scanner operates on raw bytes, so files opened in text mode are 
+    # encoded back to UTF-8.
+    data = target.read()
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return _loadbib(data)
+
+
+def _loadbib(data):
+    """Helper function that builds the loadbib() collection from raw data
+    c = _loadbib(data)
+    
+data may be bytes or an mmap of the file.  It is scanned in place through a
+memoryview, so a mapped file is paged in by the OS instead of being copied.
+"""
+    output = MasterCollection()
+    output.doc = 'Created by eikosi.loadbib()'
+
+    # Do the newline translation that text mode would have done.  This is 
+    # the only case that needs a copy of the data.
+    if data.find(b'\r') >= 0:
+        data = bytes(data).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+    # The view is released on the way out, even if the scanner raises, so 
+    # that the caller is free to close the map.
+    newentries = []
+    with memoryview(data) as view:
+        for activetype, activename, bib in _bibscan(view):
+            # If this is a recognized entry type
+            et = _BIBTYPES.get(activetype)
+            if et is None:
+                raise Exception(f'loadbib: Unrecognized entry type {activetype} in entry {activename}.')
+            # Create the entry instance.  The scanner only produces str 
+            # items, and post() does the conversion to each item's data type.
+            newentry = et(activename)
+            newentry.bib.update(bib)
+            newentry.post()
+            newentries.append(newentry)
+    output.update(newentries)
         
     return output
@@ -34,7 +34,8 @@ With Eikosi, the record for each bibliography entry only lives in one place,
 so changes to it will be universally applied from then on.  
 """
 
-data_files = [os.path.join('example', this) for this in os.listdir('example')]
+with os.scandir('example') as entries:
+    data_files = [this.path for this in entries if this.is_file()]
 
 setuptools.setup(
     name="eikosi",
@@ -60,5 +61,5 @@ setuptools.setup(
         "Topic :: Scientific/Engineering",
         "Topic :: Database",
     ],
-    python_requires='>=3.0',
+    python_requires='>=3.7',
 )